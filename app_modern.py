@@ -2893,9 +2893,8 @@ elif page == "💼 Portfolio Manager":
                 st.markdown("### 📊 Correlation Matrix")
 
                 df_returns = pd.DataFrame(returns_dict).dropna()
-                corr_matrix = df_returns.corr()
 
-                fig_corr = create_heatmap(corr_matrix, "Portfolio Correlation")
+                fig_corr = create_heatmap(df_returns, "Portfolio Correlation", raw=True)
                 st.plotly_chart(fig_corr, use_container_width=True)
 
             # ═══════════════════════════════════════════════════════════════
@@ -4,7 +4,10 @@ TradeGenius AI - Source Package
 
 from .data_loader import load_stock_data, get_stock_info, get_multiple_stocks
 from .fundamental_analysis import get_fundamentals, get_news_sentiment, get_analyst_ratings
-from .technical_indicators import calculate_technical_indicators, get_trend, generate_signals
+from .technical_indicators import (
+    calculate_technical_indicators, calculate_technical_indicators_batch, update_technical_indicators,
+    calculate_technical_indicators_polars, get_trend, generate_signals
+)
 from .feature_engineering import engineer_advanced_features, select_best_features
 from .models import train_random_forest, train_xgboost, create_ensemble_model
 from .metrics import sharpe_ratio, max_drawdown, sortino_ratio, calculate_all_metrics
@@ -20,6 +23,9 @@ __all__ = [
     'get_news_sentiment',
     'get_analyst_ratings',
     'calculate_technical_indicators',
+    'calculate_technical_indicators_batch',
+    'update_technical_indicators',
+    'calculate_technical_indicators_polars',
     'get_trend',
     'generate_signals',
     'engineer_advanced_features',
@@ -16,6 +16,11 @@ import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import warnings
+from scipy.signal import lfilter
+from .rolling import (
+    ema, pct_change, rolling_argmax, rolling_argmin, rolling_max, rolling_mean, rolling_means,
+    rolling_min, rolling_std, rolling_wma, shift, true_range
+)
 warnings.filterwarnings('ignore')
 
 # ══════════════════════════════════════════════════════════════════════
@@ -34,34 +39,44 @@ def calculate_advanced_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """
     df = df.copy()
 
+    # Pull the price columns out once; the EMA family below runs on the raw
+    # arrays instead of re-extracting Close for every ewm call
+    close = df['Close'].to_numpy(dtype=np.float64)
+    high = df['High'].to_numpy(dtype=np.float64)
+    low = df['Low'].to_numpy(dtype=np.float64)
+    volume = df['Volume'].to_numpy(dtype=np.float64)
+
     # ─── TREND INDICATORS ───
 
     # 1. Simple Moving Averages (Multiple periods)
+    # All windows (plus the 34-bar Awesome Oscillator leg) come from one
+    # cumulative sum of Close
+    smas = rolling_means(close, (5, 10, 20, 34, 50, 100, 200))
     for period in [5, 10, 20, 50, 100, 200]:
-        df[f'SMA_{period}'] = df['Close'].rolling(window=period).mean()
+        df[f'SMA_{period}'] = smas[period]
 
-    # 2. Exponential Moving Averages
+    # 2. Exponential Moving Averages (EMA20 is shared by DEMA, TEMA and Keltner)
+    emas = {period: ema(close, period) for period in [9, 12, 20, 21, 26, 50]}
     for period in [9, 12, 21, 26, 50]:
-        df[f'EMA_{period}'] = df['Close'].ewm(span=period, adjust=False).mean()
+        df[f'EMA_{period}'] = emas[period]
 
     # 3. Double EMA (DEMA)
-    ema_20 = df['Close'].ewm(span=20, adjust=False).mean()
-    df['DEMA_20'] = 2 * ema_20 - ema_20.ewm(span=20, adjust=False).mean()
+    ema_20 = emas[20]
+    ema_ema_20 = ema(ema_20, 20)
+    df['DEMA_20'] = 2 * ema_20 - ema_ema_20
 
     # 4. Triple EMA (TEMA)
-    ema1 = df['Close'].ewm(span=20, adjust=False).mean()
-    ema2 = ema1.ewm(span=20, adjust=False).mean()
-    ema3 = ema2.ewm(span=20, adjust=False).mean()
-    df['TEMA_20'] = 3 * ema1 - 3 * ema2 + ema3
+    df['TEMA_20'] = 3 * ema_20 - 3 * ema_ema_20 + ema(ema_ema_20, 20)
 
     # 5. Weighted Moving Average (WMA)
-    weights = np.arange(1, 21)
-    df['WMA_20'] = df['Close'].rolling(20).apply(lambda x: np.dot(x, weights) / weights.sum(), raw=True)
+    # Window-based indicators below reduce strided window views in one call
+    # instead of running a Python lambda per window through rolling().apply
+    wma_full = rolling_wma(close, 20)
+    df['WMA_20'] = wma_full
 
     # 6. Hull Moving Average (HMA) - Faster, smoother
-    wma_half = df['Close'].rolling(10).apply(lambda x: np.dot(x, np.arange(1, 11)) / np.arange(1, 11).sum(), raw=True)
-    wma_full = df['Close'].rolling(20).apply(lambda x: np.dot(x, np.arange(1, 21)) / np.arange(1, 21).sum(), raw=True)
-    df['HMA_20'] = (2 * wma_half - wma_full).rolling(4).mean()
+    wma_half = rolling_wma(close, 10)
+    df['HMA_20'] = rolling_mean(2 * wma_half - wma_full, 4)
 
     # 7. VWAP (Volume Weighted Average Price)
     df['VWAP'] = (df['Volume'] * (df['High'] + df['Low'] + df['Close']) / 3).cumsum() / df['Volume'].cumsum()
@@ -72,41 +87,46 @@ def calculate_advanced_indicators(df: pd.DataFrame) -> pd.DataFrame:
     # ─── MOMENTUM INDICATORS ───
 
     # 9. RSI (Multiple periods)
+    # The price change and its gain/loss split are shared by all periods,
+    # and each side's averages come from one running sum
+    delta = close - shift(close)
+    avg_gain = rolling_means(np.where(delta > 0, delta, 0.0), (7, 14, 21))
+    avg_loss = rolling_means(np.where(delta < 0, -delta, 0.0), (7, 14, 21))
     for period in [7, 14, 21]:
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
+        rs = avg_gain[period] / avg_loss[period]
         df[f'RSI_{period}'] = 100 - (100 / (1 + rs))
 
     # 10. Stochastic RSI
-    rsi = df['RSI_14']
-    stoch_rsi = (rsi - rsi.rolling(14).min()) / (rsi.rolling(14).max() - rsi.rolling(14).min())
-    df['StochRSI_K'] = stoch_rsi.rolling(3).mean() * 100
-    df['StochRSI_D'] = df['StochRSI_K'].rolling(3).mean()
+    rsi = df['RSI_14'].to_numpy()
+    rsi_low = rolling_min(rsi, 14)
+    stoch_rsi = (rsi - rsi_low) / (rolling_max(rsi, 14) - rsi_low)
+    stoch_rsi_k = rolling_mean(stoch_rsi, 3) * 100
+    df['StochRSI_K'] = stoch_rsi_k
+    df['StochRSI_D'] = rolling_mean(stoch_rsi_k, 3)
 
     # 11. MACD (Standard and Histogram)
-    ema_12 = df['Close'].ewm(span=12, adjust=False).mean()
-    ema_26 = df['Close'].ewm(span=26, adjust=False).mean()
-    df['MACD'] = ema_12 - ema_26
-    df['MACD_Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
-    df['MACD_Histogram'] = df['MACD'] - df['MACD_Signal']
+    macd = emas[12] - emas[26]
+    macd_signal = ema(macd, 9)
+    df['MACD'] = macd
+    df['MACD_Signal'] = macd_signal
+    df['MACD_Histogram'] = macd - macd_signal
 
     # 12. Stochastic Oscillator
-    low_14 = df['Low'].rolling(14).min()
-    high_14 = df['High'].rolling(14).max()
-    df['Stoch_K'] = 100 * (df['Close'] - low_14) / (high_14 - low_14)
-    df['Stoch_D'] = df['Stoch_K'].rolling(3).mean()
+    low_14 = rolling_min(low, 14)
+    high_14 = rolling_max(high, 14)
+    stoch_k = 100 * (close - low_14) / (high_14 - low_14)
+    df['Stoch_K'] = stoch_k
+    df['Stoch_D'] = rolling_mean(stoch_k, 3)
 
     # 13. Williams %R
-    df['Williams_R'] = -100 * (high_14 - df['Close']) / (high_14 - low_14)
+    df['Williams_R'] = -100 * (high_14 - close) / (high_14 - low_14)
 
     # 14. Commodity Channel Index (CCI)
-    tp = (df['High'] + df['Low'] + df['Close']) / 3
-    df['CCI'] = (tp - tp.rolling(20).mean()) / (0.015 * tp.rolling(20).std())
+    tp = (high + low + close) / 3
+    df['CCI'] = (tp - rolling_mean(tp, 20)) / (0.015 * rolling_std(tp, 20))
 
     # 15. Rate of Change (ROC)
-    df['ROC'] = df['Close'].pct_change(periods=10) * 100
+    df['ROC'] = pct_change(close, 10) * 100
 
     # 16. Momentum
     df['Momentum'] = df['Close'] - df['Close'].shift(10)
@@ -120,16 +140,19 @@ def calculate_advanced_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df['Ultimate_Oscillator'] = 100 * (4 * avg7 + 2 * avg14 + avg28) / 7
 
     # 18. Awesome Oscillator
-    df['Awesome_Oscillator'] = df['Close'].rolling(5).mean() - df['Close'].rolling(34).mean()
+    df['Awesome_Oscillator'] = smas[5] - smas[34]
 
     # ─── VOLATILITY INDICATORS ───
 
     # 19. ATR (Average True Range)
-    df['ATR_14'] = calculate_atr(df, 14)
-    df['ATR_20'] = calculate_atr(df, 20)
+    # The true range is built once and shared by ATR14/20 and Keltner's ATR10
+    ranges = true_range(high, low, shift(close))
+    atrs = rolling_means(ranges, (10, 14, 20))
+    df['ATR_14'] = atrs[14]
+    df['ATR_20'] = atrs[20]
 
     # 20. Bollinger Bands
-    sma_20 = df['Close'].rolling(20).mean()
+    sma_20 = smas[20]
     std_20 = df['Close'].rolling(20).std()
     df['BB_Upper'] = sma_20 + (2 * std_20)
     df['BB_Middle'] = sma_20
@@ -138,29 +161,28 @@ def calculate_advanced_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df['BB_Percent'] = (df['Close'] - df['BB_Lower']) / (df['BB_Upper'] - df['BB_Lower'])
 
     # 21. Keltner Channel
-    ema_20 = df['Close'].ewm(span=20, adjust=False).mean()
-    atr_10 = calculate_atr(df, 10)
+    atr_10 = atrs[10]
     df['Keltner_Upper'] = ema_20 + (2 * atr_10)
     df['Keltner_Middle'] = ema_20
     df['Keltner_Lower'] = ema_20 - (2 * atr_10)
 
     # 22. Donchian Channel
-    df['Donchian_Upper'] = df['High'].rolling(20).max()
-    df['Donchian_Lower'] = df['Low'].rolling(20).min()
+    df['Donchian_Upper'] = rolling_max(high, 20)
+    df['Donchian_Lower'] = rolling_min(low, 20)
     df['Donchian_Middle'] = (df['Donchian_Upper'] + df['Donchian_Lower']) / 2
 
     # 23. Historical Volatility
-    df['HV_20'] = df['Close'].pct_change().rolling(20).std() * np.sqrt(252) * 100
+    df['HV_20'] = rolling_std(pct_change(close), 20) * np.sqrt(252) * 100
 
     # 24. Chaikin Volatility
-    hl_diff = df['High'] - df['Low']
-    ema_hl = hl_diff.ewm(span=10, adjust=False).mean()
-    df['Chaikin_Volatility'] = (ema_hl - ema_hl.shift(10)) / ema_hl.shift(10) * 100
+    ema_hl = ema(high - low, 10)
+    prev_ema_hl = shift(ema_hl, 10)
+    df['Chaikin_Volatility'] = (ema_hl - prev_ema_hl) / prev_ema_hl * 100
 
     # ─── VOLUME INDICATORS ───
 
     # 25. On-Balance Volume (OBV)
-    df['OBV'] = (np.sign(df['Close'].diff()) * df['Volume']).fillna(0).cumsum()
+    df['OBV'] = np.nancumsum(np.sign(np.diff(close, prepend=np.nan)) * volume)
 
     # 26. Accumulation/Distribution Line
     clv = ((df['Close'] - df['Low']) - (df['High'] - df['Close'])) / (df['High'] - df['Low'])
@@ -178,7 +200,7 @@ def calculate_advanced_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df['CMF'] = mfv.rolling(20).sum() / df['Volume'].rolling(20).sum()
 
     # 29. Volume Rate of Change
-    df['VROC'] = df['Volume'].pct_change(periods=14) * 100
+    df['VROC'] = pct_change(volume, 14) * 100
 
     # 30. Force Index
     df['Force_Index'] = df['Close'].diff() * df['Volume']
@@ -190,8 +212,8 @@ def calculate_advanced_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df['ADX'] = calculate_adx(df, 14)
 
     # 32. Aroon Oscillator
-    df['Aroon_Up'] = df['High'].rolling(25).apply(lambda x: x.argmax() / 24 * 100, raw=True)
-    df['Aroon_Down'] = df['Low'].rolling(25).apply(lambda x: x.argmin() / 24 * 100, raw=True)
+    df['Aroon_Up'] = rolling_argmax(high, 25) / 24 * 100
+    df['Aroon_Down'] = rolling_argmin(low, 25) / 24 * 100
     df['Aroon_Oscillator'] = df['Aroon_Up'] - df['Aroon_Down']
 
     # 33. Parabolic SAR (with direction)
@@ -221,11 +243,9 @@ def calculate_advanced_indicators(df: pd.DataFrame) -> pd.DataFrame:
 
 def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     """Calculate Average True Range"""
-    high_low = df['High'] - df['Low']
-    high_close = abs(df['High'] - df['Close'].shift())
-    low_close = abs(df['Low'] - df['Close'].shift())
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    return tr.rolling(period).mean()
+    close = df['Close'].to_numpy(dtype=np.float64)
+    tr = true_range(df['High'].to_numpy(dtype=np.float64), df['Low'].to_numpy(dtype=np.float64), shift(close))
+    return pd.Series(rolling_mean(tr, period), index=df.index)
 
 def calculate_supertrend(
     df: pd.DataFrame,
@@ -329,11 +349,8 @@ def calculate_adx(df: pd.DataFrame, period: int = 14) -> pd.Series:
     close = df['Close']
 
     # ─── 1. True Range ───────────────────────────────────────────────────
-    tr = pd.DataFrame(index=df.index)
-    tr['h_l'] = high - low
-    tr['h_pc'] = (high - close.shift(1)).abs()
-    tr['l_pc'] = (low - close.shift(1)).abs()
-    tr['tr'] = tr.max(axis=1)
+    tr = pd.Series(true_range(high.to_numpy(dtype=np.float64), low.to_numpy(dtype=np.float64),
+                               shift(close.to_numpy(dtype=np.float64))), index=df.index)
 
     # ─── 2. Directional Movement ────────────────────────────────────────
     up = high.diff()
@@ -352,16 +369,18 @@ def calculate_adx(df: pd.DataFrame, period: int = 14) -> pd.Series:
 
     # ─── 3. Wilder smoothing function ────────────────────────────────────
     def wilder_smooth(series: pd.Series, period: int) -> pd.Series:
-        smoothed = series.copy()
+        smoothed = series.to_numpy(dtype=np.float64).copy()
         # First value: simple sum over period
-        smoothed.iloc[period-1] = series.iloc[:period].sum()
-        # Recursive Wilder: prev * (period-1) + current / period
-        for i in range(period, len(series)):
-            smoothed.iloc[i] = (smoothed.iloc[i-1] * (period - 1) + series.iloc[i]) / period
-        return smoothed
+        seed = np.nansum(smoothed[:period])
+        smoothed[period-1] = seed
+        # Recursive Wilder: prev * (period-1) + current / period, run as a
+        # single IIR filter pass instead of a Python loop over .iloc
+        decay = (period - 1) / period
+        smoothed[period:], _ = lfilter([1 / period], [1.0, -decay], smoothed[period:], zi=[decay * seed])
+        return pd.Series(smoothed, index=series.index)
 
     # Apply Wilder smoothing
-    atr = wilder_smooth(tr['tr'], period)
+    atr = wilder_smooth(tr, period)
     plus_dm_smooth = wilder_smooth(plus_dm.fillna(0), period)
     minus_dm_smooth = wilder_smooth(minus_dm.fillna(0), period)
 
@@ -1503,11 +1522,7 @@ def calculate_position_size(df: pd.DataFrame, capital: float, risk_percent: floa
     if 'ATR_14' in df.columns:
         atr = df['ATR_14'].iloc[-1]
     else:
-        high_low = df['High'] - df['Low']
-        high_close = abs(df['High'] - df['Close'].shift())
-        low_close = abs(df['Low'] - df['Close'].shift())
-        tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        atr = tr.rolling(14).mean().iloc[-1]
+        atr = calculate_atr(df, 14).iloc[-1]
 
     # Calculate stop loss distance
     stop_loss_distance = atr * atr_multiplier
@@ -2265,8 +2280,9 @@ def create_ensemble_prediction(df: pd.DataFrame, quick_mode: bool = False, deep_
     if len(df_clean) < 100:
         return {'error': 'Insufficient data for ML training'}
 
-    X = df_clean[available_features].values
-    y = df_clean['Target'].values
+    # One contiguous float32 block; the tree models work in float32 anyway
+    X = np.ascontiguousarray(df_clean[available_features].to_numpy(dtype=np.float32))
+    y = df_clean['Target'].to_numpy()
 
     # Scale features
     scaler = StandardScaler()
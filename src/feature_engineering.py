@@ -7,99 +7,144 @@ import numpy as np
 from sklearn.preprocessing import StandardScaler
 from sklearn.feature_selection import SelectKBest, f_classif, mutual_info_classif
 
+from .rolling import (
+    masked_divide, pct_change, rolling_argmax, rolling_argmin, rolling_max, rolling_means, rolling_min,
+    rolling_stds, rolling_sum, shift
+)
 
-def engineer_advanced_features(df: pd.DataFrame) -> pd.DataFrame:
+
+def engineer_advanced_features(df: pd.DataFrame, dtype=np.float64) -> pd.DataFrame:
     """
     Engineer advanced features for ML models
 
+    The features are collected in a dict and joined to the input in a single
+    concat, rather than inserted one column at a time.
+
     Args:
         df: DataFrame with OHLCV and indicators
+        dtype: dtype of the floating-point feature columns. np.float32
+            halves the memory of the feature block for model training; the
+            features are computed in float64 either way and the 0/1 flag
+            columns stay integer.
 
     Returns:
         DataFrame with additional features
     """
-    df = df.copy()
-
-    # ─── PRICE FEATURES ───
-    df['Price_Range'] = df['High'] - df['Low']
-    df['Price_Range_Pct'] = df['Price_Range'] / df['Close'] * 100
-    df['Upper_Shadow'] = df['High'] - df[['Open', 'Close']].max(axis=1)
-    df['Lower_Shadow'] = df[['Open', 'Close']].min(axis=1) - df['Low']
-    df['Body'] = abs(df['Close'] - df['Open'])
-    df['Body_Pct'] = df['Body'] / df['Close'] * 100
-
-    # ─── RETURN FEATURES ───
-    for period in [1, 2, 3, 5, 10, 20]:
-        df[f'Return_{period}d'] = df['Close'].pct_change(periods=period)
-
-    # ─── VOLATILITY FEATURES ───
-    df['Volatility_5d'] = df['Daily_Return'].rolling(5).std() if 'Daily_Return' in df.columns else df['Close'].pct_change().rolling(5).std()
-    df['Volatility_10d'] = df['Daily_Return'].rolling(10).std() if 'Daily_Return' in df.columns else df['Close'].pct_change().rolling(10).std()
-    df['Volatility_20d'] = df['Daily_Return'].rolling(20).std() if 'Daily_Return' in df.columns else df['Close'].pct_change().rolling(20).std()
-
-    # Annualized volatility
-    df['Volatility_Annual'] = df['Volatility_20d'] * np.sqrt(252) if 'Volatility_20d' in df.columns else 0
-
-    # ─── MOVING AVERAGE FEATURES ───
-    if 'SMA20' in df.columns:
-        df['Distance_SMA20'] = (df['Close'] - df['SMA20']) / df['SMA20'] * 100
-    if 'SMA50' in df.columns:
-        df['Distance_SMA50'] = (df['Close'] - df['SMA50']) / df['SMA50'] * 100
-    if 'SMA200' in df.columns:
-        df['Distance_SMA200'] = (df['Close'] - df['SMA200']) / df['SMA200'] * 100
-
-    # ─── CROSSOVER FEATURES ───
-    if 'SMA20' in df.columns and 'SMA50' in df.columns:
-        df['SMA20_Above_SMA50'] = (df['SMA20'] > df['SMA50']).astype(int)
-    if 'SMA50' in df.columns and 'SMA200' in df.columns:
-        df['SMA50_Above_SMA200'] = (df['SMA50'] > df['SMA200']).astype(int)
-    if 'EMA12' in df.columns and 'EMA26' in df.columns:
-        df['EMA12_Above_EMA26'] = (df['EMA12'] > df['EMA26']).astype(int)
-
-    # ─── MOMENTUM FEATURES ───
-    if 'RSI14' in df.columns:
-        df['RSI_Overbought'] = (df['RSI14'] > 70).astype(int)
-        df['RSI_Oversold'] = (df['RSI14'] < 30).astype(int)
-        df['RSI_Change'] = df['RSI14'].diff()
-
-    if 'MACD' in df.columns and 'MACD_Signal' in df.columns:
-        df['MACD_Above_Signal'] = (df['MACD'] > df['MACD_Signal']).astype(int)
-        df['MACD_Positive'] = (df['MACD'] > 0).astype(int)
-
-    # ─── BOLLINGER BAND FEATURES ───
-    if 'BB_Upper' in df.columns and 'BB_Lower' in df.columns:
-        df['BB_Position'] = (df['Close'] - df['BB_Lower']) / (df['BB_Upper'] - df['BB_Lower'])
-        df['Above_BB_Upper'] = (df['Close'] > df['BB_Upper']).astype(int)
-        df['Below_BB_Lower'] = (df['Close'] < df['BB_Lower']).astype(int)
-
-    # ─── VOLUME FEATURES ───
-    df['Volume_Change'] = df['Volume'].pct_change()
-    df['Volume_MA5'] = df['Volume'].rolling(5).mean()
-    df['Volume_MA20'] = df['Volume'].rolling(20).mean()
-    df['Volume_Ratio_5_20'] = df['Volume_MA5'] / df['Volume_MA20']
-
-    # ─── HIGH/LOW FEATURES ───
-    df['Days_Since_High_20'] = df['High'].rolling(20).apply(lambda x: 20 - x.argmax() - 1, raw=True)
-    df['Days_Since_Low_20'] = df['Low'].rolling(20).apply(lambda x: 20 - x.argmin() - 1, raw=True)
-
-    df['Dist_From_High_20'] = (df['High'].rolling(20).max() - df['Close']) / df['Close'] * 100
-    df['Dist_From_Low_20'] = (df['Close'] - df['Low'].rolling(20).min()) / df['Close'] * 100
-
-    # ─── TREND FEATURES ───
-    df['Higher_High'] = (df['High'] > df['High'].shift(1)).astype(int)
-    df['Higher_Low'] = (df['Low'] > df['Low'].shift(1)).astype(int)
-    df['Lower_High'] = (df['High'] < df['High'].shift(1)).astype(int)
-    df['Lower_Low'] = (df['Low'] < df['Low'].shift(1)).astype(int)
-
-    # Trend score
-    df['Trend_Score'] = df['Higher_High'] + df['Higher_Low'] - df['Lower_High'] - df['Lower_Low']
-    df['Trend_Score_5d'] = df['Trend_Score'].rolling(5).sum()
-
-    # ─── TARGET VARIABLE ───
-    df['Target'] = (df['Close'].shift(-1) > df['Close']).astype(int)
-    df['Target_5d'] = (df['Close'].shift(-5) > df['Close']).astype(int)
-
-    return df
+    out = {}
+    columns = df.columns
+
+    open_ = df['Open'].to_numpy(dtype=np.float64)
+    high = df['High'].to_numpy(dtype=np.float64)
+    low = df['Low'].to_numpy(dtype=np.float64)
+    close = df['Close'].to_numpy(dtype=np.float64)
+    volume = df['Volume'].to_numpy(dtype=np.float64)
+
+    def column(name):
+        return df[name].to_numpy(dtype=np.float64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # ─── PRICE FEATURES ───
+        out['Price_Range'] = high - low
+        out['Price_Range_Pct'] = out['Price_Range'] / close * 100
+        out['Upper_Shadow'] = high - np.fmax(open_, close)
+        out['Lower_Shadow'] = np.fmin(open_, close) - low
+        out['Body'] = np.abs(close - open_)
+        out['Body_Pct'] = out['Body'] / close * 100
+
+        # ─── RETURN FEATURES ───
+        # The 1-day return feeds the volatility windows, and all windows of a
+        # series share one set of running sums
+        returns = {period: pct_change(close, period) for period in [1, 2, 3, 5, 10, 20]}
+        for period, values in returns.items():
+            out[f'Return_{period}d'] = values
+
+        # ─── VOLATILITY FEATURES ───
+        daily_return = column('Daily_Return') if 'Daily_Return' in columns else returns[1]
+        volatility = rolling_stds(daily_return, (5, 10, 20))
+        out['Volatility_5d'] = volatility[5]
+        out['Volatility_10d'] = volatility[10]
+        out['Volatility_20d'] = volatility[20]
+
+        # Annualized volatility
+        out['Volatility_Annual'] = out['Volatility_20d'] * np.sqrt(252)
+
+        # ─── MOVING AVERAGE FEATURES ───
+        if 'SMA20' in columns:
+            out['Distance_SMA20'] = (close - column('SMA20')) / column('SMA20') * 100
+        if 'SMA50' in columns:
+            out['Distance_SMA50'] = (close - column('SMA50')) / column('SMA50') * 100
+        if 'SMA200' in columns:
+            out['Distance_SMA200'] = (close - column('SMA200')) / column('SMA200') * 100
+
+        # ─── CROSSOVER FEATURES ───
+        if 'SMA20' in columns and 'SMA50' in columns:
+            out['SMA20_Above_SMA50'] = (column('SMA20') > column('SMA50')).astype(int)
+        if 'SMA50' in columns and 'SMA200' in columns:
+            out['SMA50_Above_SMA200'] = (column('SMA50') > column('SMA200')).astype(int)
+        if 'EMA12' in columns and 'EMA26' in columns:
+            out['EMA12_Above_EMA26'] = (column('EMA12') > column('EMA26')).astype(int)
+
+        # ─── MOMENTUM FEATURES ───
+        if 'RSI14' in columns:
+            rsi = column('RSI14')
+            out['RSI_Overbought'] = (rsi > 70).astype(int)
+            out['RSI_Oversold'] = (rsi < 30).astype(int)
+            out['RSI_Change'] = rsi - shift(rsi)
+
+        if 'MACD' in columns and 'MACD_Signal' in columns:
+            out['MACD_Above_Signal'] = (column('MACD') > column('MACD_Signal')).astype(int)
+            out['MACD_Positive'] = (column('MACD') > 0).astype(int)
+
+        # ─── BOLLINGER BAND FEATURES ───
+        if 'BB_Upper' in columns and 'BB_Lower' in columns:
+            bb_upper = column('BB_Upper')
+            bb_lower = column('BB_Lower')
+            out['BB_Position'] = (close - bb_lower) / (bb_upper - bb_lower)
+            out['Above_BB_Upper'] = (close > bb_upper).astype(int)
+            out['Below_BB_Lower'] = (close < bb_lower).astype(int)
+
+        # ─── VOLUME FEATURES ───
+        volume_ma = rolling_means(volume, (5, 20))
+        out['Volume_Change'] = pct_change(volume)
+        out['Volume_MA5'] = volume_ma[5]
+        out['Volume_MA20'] = volume_ma[20]
+        out['Volume_Ratio_5_20'] = masked_divide(volume_ma[5], volume_ma[20])
+
+        # ─── HIGH/LOW FEATURES ───
+        # Strided 20-bar windows instead of a Python lambda per window
+        out['Days_Since_High_20'] = 19 - rolling_argmax(high, 20)
+        out['Days_Since_Low_20'] = 19 - rolling_argmin(low, 20)
+
+        out['Dist_From_High_20'] = (rolling_max(high, 20) - close) / close * 100
+        out['Dist_From_Low_20'] = (close - rolling_min(low, 20)) / close * 100
+
+        # ─── TREND FEATURES ───
+        prev_high = shift(high)
+        prev_low = shift(low)
+        out['Higher_High'] = (high > prev_high).astype(int)
+        out['Higher_Low'] = (low > prev_low).astype(int)
+        out['Lower_High'] = (high < prev_high).astype(int)
+        out['Lower_Low'] = (low < prev_low).astype(int)
+
+        # Trend score
+        out['Trend_Score'] = out['Higher_High'] + out['Higher_Low'] - out['Lower_High'] - out['Lower_Low']
+        out['Trend_Score_5d'] = rolling_sum(out['Trend_Score'].astype(np.float64), 5)
+
+        # ─── TARGET VARIABLE ───
+        out['Target'] = (shift(close, -1) > close).astype(int)
+        out['Target_5d'] = (shift(close, -5) > close).astype(int)
+
+    features = pd.DataFrame({
+        name: values.astype(dtype, copy=False) if values.dtype.kind == 'f' else values
+        for name, values in out.items()
+    }, index=df.index)
+    base = df.drop(columns=[col for col in features.columns if col in columns])
+    return pd.concat([base, features], axis=1)
+
+
+def _is_feature_dtype(dtype) -> bool:
+    """Whether a column dtype can be used as a model feature (any int or float width)"""
+    return pd.api.types.is_float_dtype(dtype) or pd.api.types.is_integer_dtype(dtype)
 
 
 def select_best_features(df: pd.DataFrame, target_col: str = 'Target', k: int = 20) -> list:
@@ -116,7 +161,7 @@ def select_best_features(df: pd.DataFrame, target_col: str = 'Target', k: int =
     """
     # Drop non-numeric and target columns
     exclude_cols = [target_col, 'Target', 'Target_5d', 'Date', 'Open', 'High', 'Low', 'Close', 'Volume']
-    feature_cols = [col for col in df.columns if col not in exclude_cols and df[col].dtype in ['float64', 'int64']]
+    feature_cols = [col for col in df.columns if col not in exclude_cols and _is_feature_dtype(df[col].dtype)]
 
     # Prepare data
     df_clean = df[feature_cols + [target_col]].dropna()
@@ -149,24 +194,28 @@ def select_best_features(df: pd.DataFrame, target_col: str = 'Target', k: int =
         return feature_cols[:k]
 
 
-def prepare_ml_data(df: pd.DataFrame, target_col: str = 'Target', test_size: float = 0.2):
+def prepare_ml_data(df: pd.DataFrame, target_col: str = 'Target', test_size: float = 0.2,
+                    dtype=np.float32):
     """
     Prepare data for ML training
 
+    The features are copied out of the DataFrame once, into a single
+    C-contiguous block, and the cleaning, split and scaling all work on
+    that array.
+
     Args:
         df: DataFrame with features
         target_col: Target column name
         test_size: Fraction of data for testing
+        dtype: Float dtype of the feature arrays (float32 by default)
 
     Returns:
         X_train, X_test, y_train, y_test, feature_names
     """
-    from sklearn.model_selection import train_test_split
-
     # Get feature columns
     exclude_cols = [target_col, 'Target', 'Target_5d', 'Date', 'Open', 'High', 'Low', 'Close', 'Volume',
                    'Dividends', 'Stock_Splits']
-    feature_cols = [col for col in df.columns if col not in exclude_cols and df[col].dtype in ['float64', 'int64']]
+    feature_cols = [col for col in df.columns if col not in exclude_cols and _is_feature_dtype(df[col].dtype)]
 
     # Clean data
     df_clean = df[feature_cols + [target_col]].dropna()
@@ -174,12 +223,14 @@ def prepare_ml_data(df: pd.DataFrame, target_col: str = 'Target', test_size: flo
     if len(df_clean) < 50:
         return None, None, None, None, []
 
-    X = df_clean[feature_cols]
-    y = df_clean[target_col]
+    X = np.ascontiguousarray(df_clean[feature_cols].to_numpy(dtype=dtype))
+    y = df_clean[target_col].to_numpy()
 
-    # Handle infinite values
-    X = X.replace([np.inf, -np.inf], np.nan)
-    X = X.fillna(X.mean())
+    # Handle infinite values: replace them with the column mean of the finite values
+    infinite = np.isinf(X)
+    if infinite.any():
+        X[infinite] = np.nan
+        X = np.where(infinite, np.nanmean(X, axis=0), X)
 
     # Split data (time-series aware - no shuffle)
     split_idx = int(len(X) * (1 - test_size))
@@ -191,5 +242,5 @@ def prepare_ml_data(df: pd.DataFrame, target_col: str = 'Target', test_size: flo
     X_train_scaled = scaler.fit_transform(X_train)
     X_test_scaled = scaler.transform(X_test)
 
-    return X_train_scaled, X_test_scaled, y_train.values, y_test.values, feature_cols
+    return X_train_scaled, X_test_scaled, y_train, y_test, feature_cols
 
@@ -0,0 +1,254 @@
+"""
+Rolling Window Kernels for TradeGenius AI
+
+Array versions of the pandas rolling, shift and EWM operations used by the
+indicator and feature modules. All of them work along the first axis, so a
+2-D array (time x symbols) is processed in a single pass.
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+
+def _running_totals(x: np.ndarray) -> tuple:
+    """
+    Cumulative sum and cumulative count of missing values along the first axis
+
+    NaN and inf both count as missing and add 0 to the sum. An inf in the
+    sum would turn every later window into ``inf - inf``. Only the windows
+    that contain it are blanked, as pandas does.
+    """
+    missing = ~np.isfinite(x)
+    return np.cumsum(np.where(missing, 0.0, x), axis=0), np.cumsum(missing, axis=0)
+
+
+def _window_sum(csum: np.ndarray, ccount: np.ndarray, window: int) -> np.ndarray:
+    """Rolling sums for one window from precomputed ``_running_totals``"""
+    out = np.full(csum.shape, np.nan)
+    if len(csum) < window:
+        return out
+
+    sums = csum[window - 1:].copy()
+    sums[1:] -= csum[:-window]
+    counts = ccount[window - 1:].copy()
+    counts[1:] -= ccount[:-window]
+
+    sums[counts > 0] = np.nan
+    out[window - 1:] = sums
+    return out
+
+
+def _flat_runs(x: np.ndarray):
+    """
+    Length of the run of identical finite values ending at each row
+
+    A window is flat when the run is at least as long as the window. The
+    mean of a flat window is its value, as pandas returns it, and its std is
+    exactly 0. The running sums leave rounding residue there, so the mean and
+    std kernels snap flat windows to those values. Returns None when ``x``
+    never repeats a value, which is the common case.
+    """
+    repeats = x[1:] == x[:-1]
+    if not repeats.any():
+        return None
+
+    rows = np.arange(len(x)).reshape((len(x),) + (1,) * (x.ndim - 1))
+    change = np.ones(x.shape, dtype=bool)
+    change[1:] = ~repeats
+    starts = np.maximum.accumulate(np.where(change, rows, 0), axis=0)
+    return np.where(np.isfinite(x), rows - starts + 1, 0)
+
+
+def rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling sum along the first axis using a running (cumulative) sum
+
+    Each output row costs one add and one subtract instead of re-summing the
+    whole window. Matches pandas ``rolling(window).sum()``: the first
+    ``window - 1`` rows and any window containing a NaN or inf are NaN.
+
+    Args:
+        x: Input array (1-D, or 2-D with time on the first axis)
+        window: Window length
+
+    Returns:
+        Array of the same shape with the rolling sums
+    """
+    return _window_sum(*_running_totals(x), window)
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean along the first axis (see ``rolling_sum``); flat windows give their exact value"""
+    return rolling_means(x, (window,))[window]
+
+
+def rolling_means(x: np.ndarray, windows) -> dict:
+    """
+    Rolling means for several windows from a single cumulative sum
+
+    Windows of identical values return that value exactly, like pandas, so
+    a flat close is not turned into noise around itself.
+
+    Args:
+        x: Input array (1-D, or 2-D with time on the first axis)
+        windows: Iterable of window lengths
+
+    Returns:
+        Dict mapping each window length to its rolling mean
+    """
+    csum, ccount = _running_totals(x)
+    runs = _flat_runs(x)
+
+    means = {}
+    for window in windows:
+        means[window] = _window_sum(csum, ccount, window) / window
+        if runs is not None:
+            means[window] = np.where(runs >= window, x, means[window])
+    return means
+
+
+def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling sample standard deviation from running sums of x and x**2
+
+    ``var = (S2 - S1**2 / w) / (w - 1)`` only needs the two running sums, so
+    no window is re-scanned. The input is centred first to keep the
+    subtraction well conditioned, and flat windows are exactly 0. Matches
+    pandas ``rolling(window).std()``.
+    """
+    return rolling_stds(x, (window,))[window]
+
+
+def rolling_stds(x: np.ndarray, windows) -> dict:
+    """Rolling standard deviations for several windows sharing one pair of running sums"""
+    # Centre on the mean of the finite values; windows holding a NaN or inf
+    # are blanked by the running totals anyway
+    centred = x - np.nanmean(np.where(np.isfinite(x), x, np.nan), axis=0) if len(x) else x
+    csum, ccount = _running_totals(centred)
+    csum2, _ = _running_totals(centred * centred)
+    runs = _flat_runs(x)
+
+    stds = {}
+    for window in windows:
+        s1 = _window_sum(csum, ccount, window)
+        s2 = _window_sum(csum2, ccount, window)
+        var = (s2 - s1 * s1 / window) / (window - 1)
+        stds[window] = np.sqrt(np.maximum(var, 0.0))
+        if runs is not None and window > 1:
+            stds[window] = np.where(runs >= window, 0.0, stds[window])
+    return stds
+
+
+def rolling_windows(x: np.ndarray, window: int, reduce) -> np.ndarray:
+    """
+    Apply ``reduce(windows, axis=-1)`` over trailing windows along the first axis
+
+    The windows are a strided ``sliding_window_view`` of ``x``, so no copy is
+    made and the reduction runs in a single C loop instead of pandas'
+    per-window ``rolling().apply``. The first ``window - 1`` rows are NaN.
+    """
+    out = np.full(x.shape, np.nan)
+    if len(x) >= window:
+        out[window - 1:] = reduce(sliding_window_view(x, window, axis=0), axis=-1)
+    return out
+
+
+def rolling_max(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling maximum; NaN wherever the window has a gap, like pandas"""
+    return rolling_windows(x, window, np.max)
+
+
+def rolling_min(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling minimum; NaN wherever the window has a gap, like pandas"""
+    return rolling_windows(x, window, np.min)
+
+
+def rolling_argmax(x: np.ndarray, window: int) -> np.ndarray:
+    """Position of the maximum inside each trailing window (NaN for gaps)"""
+    def reduce(windows, axis):
+        return np.where(np.isnan(windows).any(axis=axis), np.nan, windows.argmax(axis=axis))
+    return rolling_windows(x, window, reduce)
+
+
+def rolling_argmin(x: np.ndarray, window: int) -> np.ndarray:
+    """Position of the minimum inside each trailing window (NaN for gaps)"""
+    def reduce(windows, axis):
+        return np.where(np.isnan(windows).any(axis=axis), np.nan, windows.argmin(axis=axis))
+    return rolling_windows(x, window, reduce)
+
+
+def rolling_wma(x: np.ndarray, window: int) -> np.ndarray:
+    """Linearly weighted moving average (weights 1..window, newest heaviest)"""
+    weights = np.arange(1, window + 1)
+    return rolling_windows(x, window, lambda windows, axis: windows @ weights / weights.sum())
+
+
+def ema(x: np.ndarray, span: int, initial=None) -> np.ndarray:
+    """
+    Exponential moving average along the first axis
+
+    Equivalent to pandas ``ewm(span=span, adjust=False).mean()``, run as one
+    first-order IIR filter pass (``y[i] = a*x[i] + (1-a)*y[i-1]``, seeded
+    with ``y[0] = x[0]``). Inputs with gaps fall back to pandas so missing
+    bars are weighted exactly as before.
+
+    Args:
+        x: Input array (1-D, or 2-D with time on the first axis)
+        span: EMA span
+        initial: EMA value of the bar before ``x[0]``, to continue an
+            existing series instead of starting a new one
+    """
+    if len(x) == 0:
+        return x.copy()
+
+    head = x[:1] if initial is None else np.broadcast_to(np.asarray(initial, dtype=np.float64), x[:1].shape)
+    if np.isnan(x).any():
+        if initial is None:
+            return pd.DataFrame(x).ewm(span=span, adjust=False).mean().to_numpy().reshape(x.shape)
+        seeded = np.concatenate([head, x])
+        return pd.DataFrame(seeded).ewm(span=span, adjust=False).mean().to_numpy()[1:].reshape(x.shape)
+
+    alpha = 2.0 / (span + 1)
+    smoothed, _ = lfilter([alpha], [1.0, alpha - 1.0], x, axis=0, zi=(1 - alpha) * head)
+    return smoothed
+
+
+def shift(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Shift an array along the first axis like ``Series.shift``, padding with NaN"""
+    out = np.full(x.shape, np.nan)
+    if periods == 0:
+        out[:] = x
+    elif 0 < periods < len(x):
+        out[periods:] = x[:-periods]
+    elif 0 < -periods < len(x):
+        out[:periods] = x[-periods:]
+    return out
+
+
+def pct_change(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Fractional change over ``periods`` bars, like ``Series.pct_change`` without padding"""
+    return x / shift(x, periods) - 1
+
+
+def masked_divide(numerator, denominator: np.ndarray) -> np.ndarray:
+    """
+    Divide where the denominator is positive and finite, NaN elsewhere
+
+    A zero or missing denominator (e.g. a window of zero volume) gives NaN
+    instead of inf, without a divide warning.
+    """
+    out = np.full(np.shape(denominator), np.nan)
+    np.divide(numerator, denominator, out=out, where=(denominator > 0) & np.isfinite(denominator))
+    return out
+
+
+def true_range(high: np.ndarray, low: np.ndarray, prev_close: np.ndarray) -> np.ndarray:
+    """
+    True range of each bar
+
+    fmax ignores a NaN previous close (the first bar), so that bar's range is
+    just high - low, like ``DataFrame.max(axis=1)``.
+    """
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
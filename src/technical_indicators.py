@@ -2,108 +2,543 @@
 Technical Indicators Module for TradeGenius AI
 """
 
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from multiprocessing import shared_memory
+
 import pandas as pd
 import numpy as np
 
-
-def calculate_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
+from .rolling import (
+    ema, masked_divide, rolling_max, rolling_mean, rolling_means, rolling_min, rolling_std,
+    rolling_sum, shift, true_range
+)
+
+# Small LRU of computed indicator arrays, keyed by an OHLCV fingerprint.
+# Streamlit reruns and the signal/trend helpers recompute indicators for
+# the same frame repeatedly; a hit skips the whole indicator block.
+_INDICATOR_CACHE_SIZE = 16
+# Frames shorter than this are cheaper to recompute than to hash and keep
+_INDICATOR_CACHE_MIN_ROWS = 100
+
+# Incremental updates recompute this many bars before the first new one,
+# enough history for the longest rolling window (SMA200)
+_INCREMENTAL_LOOKBACK = 200
+# Recursive indicators carried across an incremental update
+_STATE_COLUMNS = pd.Index(['Close', 'EMA12', 'EMA26', 'EMA50', 'MACD_Signal', 'OBV', 'Cumulative_Return'])
+_indicator_cache = OrderedDict()
+_indicator_cache_lock = threading.Lock()
+
+
+def _indicator_arrays(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                      volume: np.ndarray, state: dict = None) -> dict:
     """
-    Calculate technical indicators for stock data
+    Compute every indicator column from raw OHLCV arrays
+
+    The price arrays are read once and all rolling windows share running
+    sums, so the whole block is a handful of vectorized passes.
 
     Args:
-        df: DataFrame with OHLCV data
+        high, low, close, volume: float64 arrays of equal length
+        state: Values of ``_STATE_COLUMNS`` on the bar before ``close[0]``.
+            When given, the recursive indicators (EMAs, OBV, cumulative
+            return) continue from it instead of starting over; rolling
+            windows still need their full lookback inside the arrays.
 
     Returns:
-        DataFrame with indicators added
+        Dict mapping indicator column names to arrays
     """
-    df = df.copy()
+    out = {}
+    state = state or {}
+    prev_close = shift(close)
+    if state:
+        prev_close[0] = state['Close']
 
     # ─── MOVING AVERAGES ───
-    df['SMA20'] = df['Close'].rolling(window=20).mean()
-    df['SMA50'] = df['Close'].rolling(window=50).mean()
-    df['SMA200'] = df['Close'].rolling(window=200).mean()
+    smas = rolling_means(close, (20, 50, 200))
+    out['SMA20'] = smas[20]
+    out['SMA50'] = smas[50]
+    out['SMA200'] = smas[200]
 
-    df['EMA12'] = df['Close'].ewm(span=12, adjust=False).mean()
-    df['EMA26'] = df['Close'].ewm(span=26, adjust=False).mean()
-    df['EMA50'] = df['Close'].ewm(span=50, adjust=False).mean()
+    out['EMA12'] = ema(close, 12, state.get('EMA12'))
+    out['EMA26'] = ema(close, 26, state.get('EMA26'))
+    out['EMA50'] = ema(close, 50, state.get('EMA50'))
 
     # ─── RSI ───
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    delta = close - prev_close
+    gain = rolling_mean(np.where(delta > 0, delta, 0.0), 14)
+    loss = rolling_mean(np.where(delta < 0, -delta, 0.0), 14)
     rs = gain / loss
-    df['RSI14'] = 100 - (100 / (1 + rs))
+    out['RSI14'] = 100 - (100 / (1 + rs))
 
     # ─── MACD ───
-    df['MACD'] = df['EMA12'] - df['EMA26']
-    df['MACD_Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
-    df['MACD_Histogram'] = df['MACD'] - df['MACD_Signal']
+    out['MACD'] = out['EMA12'] - out['EMA26']
+    out['MACD_Signal'] = ema(out['MACD'], 9, state.get('MACD_Signal'))
+    out['MACD_Histogram'] = out['MACD'] - out['MACD_Signal']
 
     # ─── BOLLINGER BANDS ───
-    df['BB_Middle'] = df['Close'].rolling(window=20).mean()
-    bb_std = df['Close'].rolling(window=20).std()
-    df['BB_Upper'] = df['BB_Middle'] + (2 * bb_std)
-    df['BB_Lower'] = df['BB_Middle'] - (2 * bb_std)
-    df['BB_Width'] = (df['BB_Upper'] - df['BB_Lower']) / df['BB_Middle']
+    out['BB_Middle'] = out['SMA20']
+    bb_std = rolling_std(close, 20)
+    out['BB_Upper'] = out['BB_Middle'] + (2 * bb_std)
+    out['BB_Lower'] = out['BB_Middle'] - (2 * bb_std)
+    out['BB_Width'] = (out['BB_Upper'] - out['BB_Lower']) / out['BB_Middle']
 
     # ─── ATR (Average True Range) ───
-    high_low = df['High'] - df['Low']
-    high_close = abs(df['High'] - df['Close'].shift())
-    low_close = abs(df['Low'] - df['Close'].shift())
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    df['ATR14'] = tr.rolling(window=14).mean()
+    tr = true_range(high, low, prev_close)
+    out['ATR14'] = rolling_mean(tr, 14)
 
     # ─── STOCHASTIC ───
-    low_14 = df['Low'].rolling(14).min()
-    high_14 = df['High'].rolling(14).max()
-    df['Stoch_K'] = 100 * (df['Close'] - low_14) / (high_14 - low_14)
-    df['Stoch_D'] = df['Stoch_K'].rolling(3).mean()
+    low_14 = rolling_min(low, 14)
+    high_14 = rolling_max(high, 14)
+    out['Stoch_K'] = 100 * (close - low_14) / (high_14 - low_14)
+    out['Stoch_D'] = rolling_mean(out['Stoch_K'], 3)
 
     # ─── VOLUME INDICATORS ───
-    df['Volume_SMA20'] = df['Volume'].rolling(window=20).mean()
-    df['Volume_Ratio'] = df['Volume'] / df['Volume_SMA20']
-
-    # OBV
-    df['OBV'] = (np.sign(df['Close'].diff()) * df['Volume']).fillna(0).cumsum()
+    # Both columns come from the one 20-bar running sum; the ratio is
+    # volume * (20 / sum), so only a single array divide is needed. A window
+    # with no volume gives a NaN ratio rather than inf
+    volume_sum = rolling_sum(volume, 20)
+    out['Volume_SMA20'] = volume_sum * (1.0 / 20)
+    out['Volume_Ratio'] = volume * masked_divide(20.0, volume_sum)
+
+    # OBV: branchless sign of the close change; nancumsum treats the missing
+    # first bar as zero flow
+    direction = (delta > 0).astype(np.float64) - (delta < 0)
+    out['OBV'] = np.nancumsum(direction * volume, axis=0) + state.get('OBV', 0.0)
 
     # ─── ADX (Average Directional Index) ───
-    plus_dm = df['High'].diff()
-    minus_dm = df['Low'].diff()
-    plus_dm[plus_dm < 0] = 0
-    minus_dm[minus_dm > 0] = 0
+    plus_dm = high - shift(high)
+    minus_dm = low - shift(low)
+    plus_dm = np.where(plus_dm < 0, 0.0, plus_dm)
+    minus_dm = np.where(minus_dm > 0, 0.0, minus_dm)
 
-    tr_14 = tr.rolling(14).sum()
-    plus_di = 100 * (plus_dm.rolling(14).sum() / tr_14)
-    minus_di = abs(100 * (minus_dm.rolling(14).sum() / tr_14))
+    tr_14 = rolling_sum(tr, 14)
+    plus_di = 100 * (rolling_sum(plus_dm, 14) / tr_14)
+    minus_di = np.abs(100 * (rolling_sum(minus_dm, 14) / tr_14))
 
-    dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-    df['ADX'] = dx.rolling(14).mean()
+    dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    out['ADX'] = rolling_mean(dx, 14)
 
     # ─── CCI (Commodity Channel Index) ───
-    tp = (df['High'] + df['Low'] + df['Close']) / 3
-    df['CCI'] = (tp - tp.rolling(20).mean()) / (0.015 * tp.rolling(20).std())
+    # Typical price is shared with MFI below
+    tp = (high + low + close) / 3
+    out['CCI'] = (tp - rolling_mean(tp, 20)) / (0.015 * rolling_std(tp, 20))
 
     # ─── Williams %R ───
-    df['Williams_R'] = -100 * (high_14 - df['Close']) / (high_14 - low_14)
+    out['Williams_R'] = -100 * (high_14 - close) / (high_14 - low_14)
 
     # ─── ROC (Rate of Change) ───
-    df['ROC'] = df['Close'].pct_change(periods=10) * 100
+    close_10 = shift(close, 10)
+    out['ROC'] = (close / close_10 - 1) * 100
 
     # ─── MFI (Money Flow Index) ───
-    tp = (df['High'] + df['Low'] + df['Close']) / 3
-    mf = tp * df['Volume']
-    positive_mf = mf.where(tp > tp.shift(1), 0).rolling(14).sum()
-    negative_mf = mf.where(tp < tp.shift(1), 0).rolling(14).sum()
-    df['MFI'] = 100 - (100 / (1 + positive_mf / negative_mf))
+    prev_tp = shift(tp)
+    mf = tp * volume
+    positive_mf = rolling_sum(np.where(tp > prev_tp, mf, 0.0), 14)
+    negative_mf = rolling_sum(np.where(tp < prev_tp, mf, 0.0), 14)
+    out['MFI'] = 100 - (100 / (1 + positive_mf / negative_mf))
 
     # ─── MOMENTUM ───
-    df['Momentum'] = df['Close'] - df['Close'].shift(10)
+    out['Momentum'] = close - close_10
 
     # ─── PRICE CHANGES ───
-    df['Daily_Return'] = df['Close'].pct_change()
-    df['Cumulative_Return'] = (1 + df['Daily_Return']).cumprod() - 1
+    daily_return = close / prev_close - 1
+    out['Daily_Return'] = daily_return
+    # nancumprod skips missing returns the same way Series.cumprod does
+    growth = 1 + state.get('Cumulative_Return', 0.0)
+    out['Cumulative_Return'] = growth * np.nancumprod(1 + daily_return, axis=0) - 1
+    out['Cumulative_Return'][np.isnan(daily_return)] = np.nan
+
+    return out
+
+
+# Output column order of _indicator_arrays, for fixed-layout buffers
+with np.errstate(divide='ignore', invalid='ignore'):
+    _INDICATOR_COLUMNS = tuple(_indicator_arrays(*np.empty((4, 0))))
+
+
+def calculate_technical_indicators(df: pd.DataFrame, dtype=np.float64) -> pd.DataFrame:
+    """
+    Calculate technical indicators for stock data
+
+    OHLCV columns are converted to NumPy once and all indicators are computed
+    on the raw arrays, then attached to the frame in a single concat instead
+    of one column insert per indicator. Results are cached per OHLCV
+    fingerprint, so repeated calls on the same data skip the computation.
+
+    Args:
+        df: DataFrame with OHLCV data
+        dtype: dtype of the indicator columns. Pass np.float32 when the output
+            only feeds ML models to halve its memory; the indicators are
+            always computed in float64 because the running-sum windows need
+            the precision.
+
+    Returns:
+        DataFrame with indicators added
+    """
+    high, low, close, volume = _ohlcv_arrays(df)
+
+    key = _ohlcv_fingerprint(df.index, high, low, close, volume)
+    out = _cache_get(key)
+    if out is None:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out = _indicator_arrays(high, low, close, volume)
+        _cache_put(key, out)
+
+    return _attach_indicators(df, out, dtype)
+
+
+def _ohlcv_arrays(df: pd.DataFrame) -> tuple:
+    """High, Low, Close and Volume as float64 arrays"""
+    return tuple(df[col].to_numpy(dtype=np.float64) for col in ('High', 'Low', 'Close', 'Volume'))
+
+
+def _attach_indicators(df: pd.DataFrame, out: dict, dtype) -> pd.DataFrame:
+    """Join indicator arrays to df in one concat, replacing stale columns"""
+    indicators = pd.DataFrame(out, index=df.index, dtype=dtype)
+    base = df.drop(columns=[col for col in indicators.columns if col in df.columns])
+    return pd.concat([base, indicators], axis=1)
+
+
+def update_technical_indicators(previous: pd.DataFrame, df: pd.DataFrame,
+                                dtype=np.float64) -> pd.DataFrame:
+    """
+    Extend an earlier indicator result with newly arrived bars
+
+    Only the new bars plus ``_INCREMENTAL_LOOKBACK`` rows of history are
+    recomputed. EMAs, OBV and the cumulative return continue from their
+    values in ``previous`` rather than being rebuilt from the first bar, so
+    a live feed pays for the new bars instead of the whole history. Falls
+    back to a full calculation when ``df`` does not extend ``previous``
+    (e.g. back-adjusted history) or ``previous`` is too short.
+
+    Args:
+        previous: Result of calculate_technical_indicators (float64) for an
+            earlier version of the data
+        df: DataFrame with OHLCV data whose leading rows are those of previous
+        dtype: dtype of the indicator columns (see calculate_technical_indicators)
+
+    Returns:
+        DataFrame with indicators for every row of df
+    """
+    n_prev = len(previous)
+    new_rows = len(df) - n_prev
+    start = n_prev - _INCREMENTAL_LOOKBACK
+    if (new_rows <= 0 or start < 1
+            or (previous.columns.get_indexer(_STATE_COLUMNS) < 0).any()
+            or df.index[n_prev - 1] != previous.index[-1]):
+        return calculate_technical_indicators(df, dtype)
+
+    arrays = []
+    for col in ('High', 'Low', 'Close', 'Volume'):
+        values = df[col].to_numpy(dtype=np.float64)
+        known = previous[col].to_numpy(dtype=np.float64)[start - 1:]
+        if not np.array_equal(values[start - 1:n_prev], known, equal_nan=True):
+            return calculate_technical_indicators(df, dtype)
+        arrays.append(values[start:])
+
+    state, = _tail_values(previous.iloc[:start], _STATE_COLUMNS)
+    if not np.isfinite(list(state.values())).all():
+        return calculate_technical_indicators(df, dtype)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = _indicator_arrays(*arrays, state=state)
+
+    indicators = pd.DataFrame({name: values[-new_rows:] for name, values in out.items()},
+                              index=df.index[n_prev:], dtype=dtype)
+    tail = df.iloc[n_prev:]
+    base = tail.drop(columns=[col for col in indicators.columns if col in tail.columns])
+    return pd.concat([previous, pd.concat([base, indicators], axis=1)])
+
+
+def calculate_technical_indicators_polars(frame):
+    """
+    Calculate the technical indicators on a Polars frame
+
+    Polars-native counterpart of calculate_technical_indicators for
+    pipelines that stay in Polars: every indicator is one expression in a
+    single ``with_columns`` call, so on a LazyFrame the query planner can
+    share common sub-expressions and run the columns in parallel. Polars is
+    an optional dependency and is only imported here.
+
+    Args:
+        frame: polars DataFrame or LazyFrame with High, Low, Close and Volume
+
+    Returns:
+        Frame of the same kind with the indicator columns added
+    """
+    import polars as pl
+
+    # Polars orders NaN above every number and carries it through ewm_mean
+    # and cum_prod; as null it is skipped the way pandas skips NaN
+    high = pl.col('High').cast(pl.Float64).fill_nan(None)
+    low = pl.col('Low').cast(pl.Float64).fill_nan(None)
+    close = pl.col('Close').cast(pl.Float64).fill_nan(None)
+    volume = pl.col('Volume').cast(pl.Float64).fill_nan(None)
+
+    prev_close = close.shift(1)
+    delta = close.diff()
+    # pandas' adjust=False EMA holds its last value through a missing bar
+    ema12 = close.ewm_mean(span=12, adjust=False).forward_fill()
+    ema26 = close.ewm_mean(span=26, adjust=False).forward_fill()
+    macd = ema12 - ema26
+    macd_signal = macd.ewm_mean(span=9, adjust=False).forward_fill()
+    sma20 = close.rolling_mean(20)
+    bb_std = close.rolling_std(20)
+    bb_upper = sma20 + 2 * bb_std
+    bb_lower = sma20 - 2 * bb_std
+    tr = pl.max_horizontal(high - low, (high - prev_close).abs(), (low - prev_close).abs())
+    low_14 = low.rolling_min(14)
+    high_14 = high.rolling_max(14)
+    stoch_k = 100 * (close - low_14) / (high_14 - low_14)
+    volume_sma20 = volume.rolling_mean(20)
+
+    gain = pl.when(delta > 0).then(delta).otherwise(0.0).rolling_mean(14)
+    loss = pl.when(delta < 0).then(-delta).otherwise(0.0).rolling_mean(14)
+
+    plus_dm = high.diff()
+    minus_dm = low.diff()
+    plus_dm = pl.when(plus_dm < 0).then(0.0).otherwise(plus_dm)
+    minus_dm = pl.when(minus_dm > 0).then(0.0).otherwise(minus_dm)
+    tr_14 = tr.rolling_sum(14)
+    plus_di = 100 * (plus_dm.rolling_sum(14) / tr_14)
+    minus_di = (100 * (minus_dm.rolling_sum(14) / tr_14)).abs()
+
+    tp = (high + low + close) / 3
+    prev_tp = tp.shift(1)
+    mf = tp * volume
+    positive_mf = pl.when(tp > prev_tp).then(mf).otherwise(0.0).rolling_sum(14)
+    negative_mf = pl.when(tp < prev_tp).then(mf).otherwise(0.0).rolling_sum(14)
+
+    close_10 = close.shift(10)
+    daily_return = close / prev_close - 1
+
+    return frame.with_columns(
+        sma20.alias('SMA20'),
+        close.rolling_mean(50).alias('SMA50'),
+        close.rolling_mean(200).alias('SMA200'),
+        ema12.alias('EMA12'),
+        ema26.alias('EMA26'),
+        close.ewm_mean(span=50, adjust=False).forward_fill().alias('EMA50'),
+        (100 - (100 / (1 + gain / loss))).alias('RSI14'),
+        macd.alias('MACD'),
+        macd_signal.alias('MACD_Signal'),
+        (macd - macd_signal).alias('MACD_Histogram'),
+        sma20.alias('BB_Middle'),
+        bb_upper.alias('BB_Upper'),
+        bb_lower.alias('BB_Lower'),
+        ((bb_upper - bb_lower) / sma20).alias('BB_Width'),
+        tr.rolling_mean(14).alias('ATR14'),
+        stoch_k.alias('Stoch_K'),
+        stoch_k.rolling_mean(3).alias('Stoch_D'),
+        volume_sma20.alias('Volume_SMA20'),
+        pl.when(volume_sma20 > 0).then(volume / volume_sma20).alias('Volume_Ratio'),
+        (pl.when(delta > 0).then(volume).when(delta < 0).then(-volume).otherwise(0.0)).cum_sum().alias('OBV'),
+        (100 * (plus_di - minus_di).abs() / (plus_di + minus_di)).rolling_mean(14).alias('ADX'),
+        ((tp - tp.rolling_mean(20)) / (0.015 * tp.rolling_std(20))).alias('CCI'),
+        (-100 * (high_14 - close) / (high_14 - low_14)).alias('Williams_R'),
+        ((close / close_10 - 1) * 100).alias('ROC'),
+        (100 - (100 / (1 + positive_mf / negative_mf))).alias('MFI'),
+        (close - close_10).alias('Momentum'),
+        daily_return.alias('Daily_Return'),
+        ((1 + daily_return).cum_prod() - 1).alias('Cumulative_Return'),
+    )
+
+
+def calculate_technical_indicators_batch(data: dict, max_workers: int = None, dtype=np.float64,
+                                         use_processes: bool = False) -> dict:
+    """
+    Calculate technical indicators for several stocks in parallel
+
+    The NumPy/SciPy kernels release the GIL for most of their work, so a
+    thread pool overlaps symbols without pickling any frames. For large
+    universes where the remaining Python overhead serialises the threads,
+    ``use_processes=True`` runs the kernels in a process pool instead, with
+    the OHLCV inputs and indicator outputs exchanged through shared memory
+    rather than pickled.
 
-    return df
+    Without ``use_processes``, when every frame shares the same index (an
+    aligned universe), the symbols are stacked side by side and computed in
+    a single vectorized pass over 2-D arrays instead, which needs no worker
+    pool at all.
+
+    Args:
+        data: Dict mapping symbols to OHLCV DataFrames (e.g. from get_multiple_stocks)
+        max_workers: Number of workers (defaults to the CPU count); unused
+            when an aligned universe takes the stacked pass
+        dtype: dtype of the indicator columns (see calculate_technical_indicators)
+        use_processes: Use worker processes instead of threads, for aligned
+            universes too
+
+    Returns:
+        Dict mapping symbols to DataFrames with indicators added
+    """
+    if not data:
+        return {}
+
+    if not use_processes and len(data) > 1 and _shares_index(data.values()):
+        return _batch_stacked(data, dtype)
+
+    workers = max_workers or min(len(data), os.cpu_count() or 1)
+    if use_processes:
+        return _batch_in_processes(data, workers, dtype)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(partial(calculate_technical_indicators, dtype=dtype), data.values())
+        return dict(zip(data.keys(), results))
+
+
+def _shares_index(frames) -> bool:
+    """Whether all frames have an identical, non-empty index"""
+    frames = iter(frames)
+    index = next(frames).index
+    return len(index) > 0 and all(df.index.equals(index) for df in frames)
+
+
+def _batch_stacked(data: dict, dtype) -> dict:
+    """
+    Aligned-universe backend of calculate_technical_indicators_batch
+
+    Uncached symbols become the columns of (bars x symbols) OHLCV arrays and
+    go through _indicator_arrays once; every helper it uses works along the
+    time axis, so each column gets exactly its single-symbol result.
+    """
+    computed = {}
+    pending = {}
+    for symbol, df in data.items():
+        arrays = _ohlcv_arrays(df)
+        key = _ohlcv_fingerprint(df.index, *arrays)
+        out = _cache_get(key)
+        if out is not None:
+            computed[symbol] = out
+        else:
+            pending[symbol] = (key, arrays)
+
+    if pending:
+        stacked = [np.column_stack(columns) for columns in zip(*(arrays for _, arrays in pending.values()))]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            block = _indicator_arrays(*stacked)
+        for col, (symbol, (key, _)) in enumerate(pending.items()):
+            out = {name: np.ascontiguousarray(values[:, col]) for name, values in block.items()}
+            _cache_put(key, out)
+            computed[symbol] = out
+
+    return {symbol: _attach_indicators(df, computed[symbol], dtype) for symbol, df in data.items()}
+
+
+def _batch_in_processes(data: dict, workers: int, dtype) -> dict:
+    """
+    Process-pool backend of calculate_technical_indicators_batch
+
+    Each uncached frame's OHLCV block is copied once into a shared-memory
+    segment; the worker attaches by name, computes the indicators and writes
+    them into a second segment sized for ``_INDICATOR_COLUMNS``. Only the
+    segment names cross the process boundary.
+    """
+    computed = {}
+    pending = {}
+    for symbol, df in data.items():
+        arrays = _ohlcv_arrays(df)
+        key = _ohlcv_fingerprint(df.index, *arrays)
+        out = _cache_get(key)
+        if out is not None:
+            computed[symbol] = out
+        elif len(df):
+            pending[symbol] = (key, np.stack(arrays))
+
+    segments = {}
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for symbol, (key, ohlcv) in pending.items():
+                n_rows = ohlcv.shape[1]
+                inputs = shared_memory.SharedMemory(create=True, size=ohlcv.nbytes)
+                outputs = shared_memory.SharedMemory(create=True, size=len(_INDICATOR_COLUMNS) * n_rows * 8)
+                segments[symbol] = (inputs, outputs)
+                np.ndarray(ohlcv.shape, dtype=np.float64, buffer=inputs.buf)[:] = ohlcv
+                futures[symbol] = executor.submit(_shared_indicator_worker, inputs.name, outputs.name, n_rows)
+
+            for symbol, future in futures.items():
+                future.result()
+                key, ohlcv = pending[symbol]
+                block = np.ndarray((len(_INDICATOR_COLUMNS), ohlcv.shape[1]), dtype=np.float64,
+                                   buffer=segments[symbol][1].buf)
+                out = dict(zip(_INDICATOR_COLUMNS, block.copy()))
+                del block
+                _cache_put(key, out)
+                computed[symbol] = out
+    finally:
+        for segment in (seg for pair in segments.values() for seg in pair):
+            segment.close()
+            segment.unlink()
+
+    return {
+        symbol: (_attach_indicators(df, computed[symbol], dtype) if symbol in computed
+                 else calculate_technical_indicators(df, dtype))
+        for symbol, df in data.items()
+    }
+
+
+def _shared_indicator_worker(inputs_name: str, outputs_name: str, n_rows: int):
+    """Compute indicators between two shared-memory segments (runs in a worker process)"""
+    inputs = shared_memory.SharedMemory(name=inputs_name)
+    outputs = shared_memory.SharedMemory(name=outputs_name)
+    try:
+        high, low, close, volume = np.ndarray((4, n_rows), dtype=np.float64, buffer=inputs.buf)
+        block = np.ndarray((len(_INDICATOR_COLUMNS), n_rows), dtype=np.float64, buffer=outputs.buf)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out = _indicator_arrays(high, low, close, volume)
+        for row, name in enumerate(_INDICATOR_COLUMNS):
+            block[row] = out[name]
+        # Views must be released before the segments can close
+        del high, low, close, volume, block
+    finally:
+        inputs.close()
+        outputs.close()
+
+
+def _ohlcv_fingerprint(index: pd.Index, high: np.ndarray, low: np.ndarray,
+                       close: np.ndarray, volume: np.ndarray):
+    """
+    Content-hash cache key for an OHLCV frame
+
+    Row count and first/last timestamps identify the bar range; a BLAKE2
+    digest of the raw High/Low/Close/Volume bytes catches any change to the
+    bars themselves, such as dividend re-adjustments, which a sum of the
+    columns could miss. Returns None (no caching) for short frames.
+    """
+    if len(index) < _INDICATOR_CACHE_MIN_ROWS:
+        return None
+    digest = hashlib.blake2b(digest_size=16)
+    for values in (high, low, close, volume):
+        digest.update(np.ascontiguousarray(values).data)
+    return (len(index), index[0], index[-1], digest.hexdigest())
+
+
+def _cache_get(key):
+    """Return cached indicator arrays for key, or None"""
+    if key is None:
+        return None
+    with _indicator_cache_lock:
+        out = _indicator_cache.get(key)
+        if out is not None:
+            _indicator_cache.move_to_end(key)
+        return out
+
+
+def _cache_put(key, out: dict):
+    """Store indicator arrays, evicting the least recently used entry"""
+    if key is None:
+        return
+    with _indicator_cache_lock:
+        _indicator_cache[key] = out
+        _indicator_cache.move_to_end(key)
+        while len(_indicator_cache) > _INDICATOR_CACHE_SIZE:
+            _indicator_cache.popitem(last=False)
 
 
 def calculate_support_resistance(df: pd.DataFrame, window: int = 20) -> dict:
@@ -117,12 +552,11 @@ def calculate_support_resistance(df: pd.DataFrame, window: int = 20) -> dict:
     Returns:
         Dict with support and resistance levels
     """
-    recent_data = df.tail(window)
-
-    support = recent_data['Low'].min()
-    resistance = recent_data['High'].max()
+    # Reduce over slices of the column arrays instead of copying df.tail()
+    support = np.nanmin(df['Low'].to_numpy()[-window:])
+    resistance = np.nanmax(df['High'].to_numpy()[-window:])
 
-    current_price = df['Close'].iloc[-1]
+    current_price = df['Close'].to_numpy()[-1]
 
     return {
         'Support': support,
@@ -133,6 +567,29 @@ def calculate_support_resistance(df: pd.DataFrame, window: int = 20) -> dict:
     }
 
 
+_TREND_COLUMNS = pd.Index(['Close', 'SMA20', 'SMA50', 'SMA200', 'RSI14', 'MACD'])
+_SIGNAL_COLUMNS = _TREND_COLUMNS.append(pd.Index(['MACD_Signal', 'BB_Upper', 'BB_Lower', 'Volume_Ratio']))
+
+
+def _tail_values(df: pd.DataFrame, columns: pd.Index, rows: int = 1) -> list:
+    """
+    Read the last rows of the given columns as dicts of plain floats
+
+    Column positions are resolved with a single ``get_indexer`` call and the
+    values are taken from a ``rows``-long slice by integer position, instead
+    of boxing whole rows with ``df.iloc``. Columns missing from the frame are
+    left out, so callers keep using ``.get(col, default)``.
+
+    Returns:
+        List of ``rows`` dicts, oldest first
+    """
+    positions = df.columns.get_indexer(columns)
+    present = positions >= 0
+    names = columns[present]
+    block = df.iloc[-rows:].take(positions[present], axis=1).to_numpy(dtype=np.float64)
+    return [dict(zip(names, values)) for values in block.tolist()]
+
+
 def get_trend(df: pd.DataFrame) -> str:
     """
     Determine the current trend
@@ -146,8 +603,17 @@ def get_trend(df: pd.DataFrame) -> str:
     if len(df) < 50:
         return 'Neutral'
 
-    latest = df.iloc[-1]
+    latest, = _tail_values(df, _TREND_COLUMNS)
+    return _trend_from_values(latest)
 
+
+def _trend_from_values(latest: dict) -> str:
+    """
+    Classify the trend from the latest Close/SMA/RSI/MACD values
+
+    Shared by get_trend and generate_signals so the signal path can reuse
+    the row values it has already read.
+    """
     # Check moving average alignment
     price = latest['Close']
     sma20 = latest.get('SMA20', price)
@@ -214,24 +680,16 @@ def generate_signals(df: pd.DataFrame) -> dict:
     if len(df) < 50:
         return {'signal': 'HOLD', 'strength': 'Weak', 'confidence': 0.5}
 
-    latest = df.iloc[-1]
-    prev = df.iloc[-2]
+    prev, latest = _tail_values(df, _SIGNAL_COLUMNS, rows=2)
 
-    buy_signals = 0
-    sell_signals = 0
-    total_signals = 0
+    # Each rule adds its weight through boolean arithmetic rather than an
+    # if/elif cascade; NaN inputs compare False and contribute nothing
+    total_signals = 7
 
     # RSI signals
     rsi = latest.get('RSI14', 50)
-    if rsi < 30:
-        buy_signals += 2
-    elif rsi > 70:
-        sell_signals += 2
-    elif rsi < 40:
-        buy_signals += 1
-    elif rsi > 60:
-        sell_signals += 1
-    total_signals += 2
+    buy_signals = 2 * (rsi < 30) + (30 <= rsi < 40)
+    sell_signals = 2 * (rsi > 70) + (60 < rsi <= 70)
 
     # MACD crossover
     macd = latest.get('MACD', 0)
@@ -239,39 +697,28 @@ def generate_signals(df: pd.DataFrame) -> dict:
     prev_macd = prev.get('MACD', 0)
     prev_signal = prev.get('MACD_Signal', 0)
 
-    if macd > macd_signal and prev_macd <= prev_signal:
-        buy_signals += 2  # Bullish crossover
-    elif macd < macd_signal and prev_macd >= prev_signal:
-        sell_signals += 2  # Bearish crossover
-    total_signals += 2
+    buy_signals += 2 * (macd > macd_signal and prev_macd <= prev_signal)  # Bullish crossover
+    sell_signals += 2 * (macd < macd_signal and prev_macd >= prev_signal)  # Bearish crossover
 
     # Price vs Bollinger Bands
     price = latest['Close']
     bb_upper = latest.get('BB_Upper', price * 1.1)
     bb_lower = latest.get('BB_Lower', price * 0.9)
 
-    if price < bb_lower:
-        buy_signals += 1
-    elif price > bb_upper:
-        sell_signals += 1
-    total_signals += 1
+    below_band = price < bb_lower
+    buy_signals += below_band
+    sell_signals += (not below_band) and price > bb_upper
 
     # Trend
-    trend = get_trend(df)
-    if trend == 'Bullish':
-        buy_signals += 1
-    elif trend == 'Bearish':
-        sell_signals += 1
-    total_signals += 1
+    trend = _trend_from_values(latest)
+    buy_signals += trend == 'Bullish'
+    sell_signals += trend == 'Bearish'
 
     # Volume confirmation
-    volume_ratio = latest.get('Volume_Ratio', 1)
-    if volume_ratio > 1.5:
-        if buy_signals > sell_signals:
-            buy_signals += 1
-        else:
-            sell_signals += 1
-    total_signals += 1
+    high_volume = latest.get('Volume_Ratio', 1) > 1.5
+    leaning_buy = buy_signals > sell_signals
+    buy_signals += high_volume and leaning_buy
+    sell_signals += high_volume and not leaning_buy
 
     # Calculate final signal
     net_signal = buy_signals - sell_signals
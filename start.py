@@ -6,24 +6,41 @@ Launches the modern UI application
 import subprocess
 import sys
 import os
+from importlib.util import find_spec
+from pathlib import Path
+
+# Written after a successful dependency check; keyed on the interpreter
+# version so switching Python re-runs the check
+DEPS_SENTINEL = Path('.deps_ok')
+
+STREAMLIT_COMMAND = [
+    sys.executable,
+    "-m",
+    "streamlit",
+    "run",
+    "app_modern.py",
+    "--server.port=8501",
+    "--server.address=localhost"
+]
 
 def check_dependencies():
     """Check if all required dependencies are installed"""
-    required_packages = [
-        'streamlit',
-        'pandas',
-        'numpy',
-        'plotly',
-        'yfinance',
-        'scikit-learn',
-        'xgboost'
-    ]
+    # pip package name -> import name
+    required_packages = {
+        'streamlit': 'streamlit',
+        'pandas': 'pandas',
+        'numpy': 'numpy',
+        'plotly': 'plotly',
+        'yfinance': 'yfinance',
+        'scikit-learn': 'sklearn',
+        'xgboost': 'xgboost'
+    }
 
+    # find_spec only locates the package; importing each one just to check
+    # it exists took seconds
     missing = []
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
+    for package, module in required_packages.items():
+        if find_spec(module) is None:
             missing.append(package)
 
     if missing:
@@ -37,6 +54,13 @@ def check_dependencies():
     print("✅ All dependencies installed!")
     return True
 
+def dependencies_checked():
+    """Check if a previous run already verified the dependencies"""
+    try:
+        return DEPS_SENTINEL.read_text(encoding='utf-8') == sys.version
+    except OSError:
+        return False
+
 def main():
     """Main function to launch the app"""
     print("=" * 60)
@@ -45,8 +69,13 @@ def main():
     print()
 
     # Check dependencies
-    if not check_dependencies():
-        sys.exit(1)
+    if not dependencies_checked():
+        if not check_dependencies():
+            sys.exit(1)
+        try:
+            DEPS_SENTINEL.write_text(sys.version, encoding='utf-8')
+        except OSError:
+            pass
 
     # Check if app_modern.py exists
     if not os.path.exists('app_modern.py'):
@@ -68,15 +97,7 @@ def main():
 
     # Launch streamlit
     try:
-        subprocess.run([
-            sys.executable,
-            "-m",
-            "streamlit",
-            "run",
-            "app_modern.py",
-            "--server.port=8501",
-            "--server.address=localhost"
-        ])
+        subprocess.run(STREAMLIT_COMMAND)
     except KeyboardInterrupt:
         print("\n\n👋 Thanks for using AI Trading Lab PRO+!")
         sys.exit(0)
@@ -0,0 +1,66 @@
+"""
+Regression tests for the rolling window kernels (src/rolling.py)
+
+Each kernel is checked against the pandas rolling operation it replaces.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.rolling import rolling_mean, rolling_std, rolling_stds, rolling_sum
+
+
+def _series(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+
+
+def _assert_matches(actual, expected):
+    assert np.array_equal(np.isnan(actual), np.isnan(expected))
+    np.testing.assert_allclose(actual[~np.isnan(actual)], expected[~np.isnan(expected)], rtol=1e-9, atol=1e-9)
+
+
+def test_rolling_kernels_match_pandas():
+    x = _series()
+    x[120] = np.nan
+    s = pd.Series(x)
+    for window in (5, 20):
+        _assert_matches(rolling_sum(x, window), s.rolling(window).sum().to_numpy())
+        _assert_matches(rolling_mean(x, window), s.rolling(window).mean().to_numpy())
+        _assert_matches(rolling_std(x, window), s.rolling(window).std().to_numpy())
+
+
+def test_non_finite_value_only_blanks_its_own_windows():
+    # A zero close turns the next return into inf; only the windows holding
+    # it may be lost, not the rest of the series
+    close = _series(600)
+    close[200] = 0.0
+    with np.errstate(divide='ignore'):
+        returns = close[1:] / close[:-1] - 1
+    assert np.isinf(returns[200])
+    expected = pd.Series(returns).rolling(20).std().to_numpy()
+    stds = rolling_stds(returns, (5, 20))
+
+    for window, std in stds.items():
+        touched = np.zeros(len(returns), dtype=bool)
+        touched[200:200 + window] = True
+        assert np.isfinite(std[window:][~touched[window:]]).all()
+        assert not np.isfinite(std[touched]).any()
+
+    finite = np.isfinite(expected)
+    np.testing.assert_allclose(stds[20][finite], expected[finite], rtol=1e-9, atol=1e-12)
+    sums = rolling_sum(returns, 20)
+    assert np.isfinite(sums[19:][~touched[19:]]).all()
+
+
+def test_flat_windows_are_exact():
+    # A suspended stock repeats its last close; the mean must equal that
+    # close exactly and the std must be 0, not rounding residue
+    close = np.concatenate([_series(300), np.full(25, 97.3)])
+    means = rolling_mean(close, 20)
+    stds = rolling_stds(close, (5, 20))
+
+    assert (means[-6:] == 97.3).all()
+    assert (stds[20][-6:] == 0.0).all()
+    assert (stds[5][-21:] == 0.0).all()
+    assert stds[20][-7] > 0.0
@@ -0,0 +1,402 @@
+"""
+Regression tests for src/technical_indicators.py
+
+calculate_technical_indicators and generate_signals are checked against the
+original pandas implementation, reproduced below as the reference, on clean
+data and on the inputs that broke the array kernels before: missing bars,
+a zero close and a flat (suspended) stretch. The other entry points are
+checked against calculate_technical_indicators on the same inputs.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import technical_indicators
+from src.technical_indicators import (
+    calculate_technical_indicators, calculate_technical_indicators_batch, generate_signals,
+    update_technical_indicators
+)
+
+
+# ─── PANDAS REFERENCE ───
+
+def _reference_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+
+    df['SMA20'] = df['Close'].rolling(window=20).mean()
+    df['SMA50'] = df['Close'].rolling(window=50).mean()
+    df['SMA200'] = df['Close'].rolling(window=200).mean()
+
+    df['EMA12'] = df['Close'].ewm(span=12, adjust=False).mean()
+    df['EMA26'] = df['Close'].ewm(span=26, adjust=False).mean()
+    df['EMA50'] = df['Close'].ewm(span=50, adjust=False).mean()
+
+    delta = df['Close'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    df['RSI14'] = 100 - (100 / (1 + gain / loss))
+
+    df['MACD'] = df['EMA12'] - df['EMA26']
+    df['MACD_Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
+    df['MACD_Histogram'] = df['MACD'] - df['MACD_Signal']
+
+    df['BB_Middle'] = df['Close'].rolling(window=20).mean()
+    bb_std = df['Close'].rolling(window=20).std()
+    df['BB_Upper'] = df['BB_Middle'] + (2 * bb_std)
+    df['BB_Lower'] = df['BB_Middle'] - (2 * bb_std)
+    df['BB_Width'] = (df['BB_Upper'] - df['BB_Lower']) / df['BB_Middle']
+
+    high_low = df['High'] - df['Low']
+    high_close = abs(df['High'] - df['Close'].shift())
+    low_close = abs(df['Low'] - df['Close'].shift())
+    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+    df['ATR14'] = tr.rolling(window=14).mean()
+
+    low_14 = df['Low'].rolling(14).min()
+    high_14 = df['High'].rolling(14).max()
+    df['Stoch_K'] = 100 * (df['Close'] - low_14) / (high_14 - low_14)
+    df['Stoch_D'] = df['Stoch_K'].rolling(3).mean()
+
+    df['Volume_SMA20'] = df['Volume'].rolling(window=20).mean()
+    df['Volume_Ratio'] = df['Volume'] / df['Volume_SMA20']
+    df['OBV'] = (np.sign(df['Close'].diff()) * df['Volume']).fillna(0).cumsum()
+
+    plus_dm = df['High'].diff()
+    minus_dm = df['Low'].diff()
+    plus_dm[plus_dm < 0] = 0
+    minus_dm[minus_dm > 0] = 0
+    tr_14 = tr.rolling(14).sum()
+    plus_di = 100 * (plus_dm.rolling(14).sum() / tr_14)
+    minus_di = abs(100 * (minus_dm.rolling(14).sum() / tr_14))
+    dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
+    df['ADX'] = dx.rolling(14).mean()
+
+    tp = (df['High'] + df['Low'] + df['Close']) / 3
+    df['CCI'] = (tp - tp.rolling(20).mean()) / (0.015 * tp.rolling(20).std())
+    df['Williams_R'] = -100 * (high_14 - df['Close']) / (high_14 - low_14)
+    df['ROC'] = df['Close'].pct_change(periods=10) * 100
+
+    mf = tp * df['Volume']
+    positive_mf = mf.where(tp > tp.shift(1), 0).rolling(14).sum()
+    negative_mf = mf.where(tp < tp.shift(1), 0).rolling(14).sum()
+    df['MFI'] = 100 - (100 / (1 + positive_mf / negative_mf))
+
+    df['Momentum'] = df['Close'] - df['Close'].shift(10)
+    df['Daily_Return'] = df['Close'].pct_change()
+    df['Cumulative_Return'] = (1 + df['Daily_Return']).cumprod() - 1
+    return df
+
+
+def _reference_trend(df: pd.DataFrame) -> str:
+    if len(df) < 50:
+        return 'Neutral'
+
+    latest = df.iloc[-1]
+    price = latest['Close']
+    sma20, sma50, sma200 = latest['SMA20'], latest['SMA50'], latest['SMA200']
+    bullish = bearish = 0
+    for ma in (sma20, sma50, sma200):
+        if price > ma:
+            bullish += 1
+        else:
+            bearish += 1
+    if sma20 > sma50 > sma200:
+        bullish += 2
+    elif sma20 < sma50 < sma200:
+        bearish += 2
+    if latest['RSI14'] > 50:
+        bullish += 1
+    else:
+        bearish += 1
+    if latest['MACD'] > 0:
+        bullish += 1
+    else:
+        bearish += 1
+
+    if bullish > bearish + 2:
+        return 'Bullish'
+    elif bearish > bullish + 2:
+        return 'Bearish'
+    return 'Neutral'
+
+
+def _reference_signals(df: pd.DataFrame) -> dict:
+    latest, prev = df.iloc[-1], df.iloc[-2]
+    buy = sell = 0
+
+    rsi = latest['RSI14']
+    if rsi < 30:
+        buy += 2
+    elif rsi > 70:
+        sell += 2
+    elif rsi < 40:
+        buy += 1
+    elif rsi > 60:
+        sell += 1
+
+    if latest['MACD'] > latest['MACD_Signal'] and prev['MACD'] <= prev['MACD_Signal']:
+        buy += 2
+    elif latest['MACD'] < latest['MACD_Signal'] and prev['MACD'] >= prev['MACD_Signal']:
+        sell += 2
+
+    price = latest['Close']
+    if price < latest['BB_Lower']:
+        buy += 1
+    elif price > latest['BB_Upper']:
+        sell += 1
+
+    trend = _reference_trend(df)
+    if trend == 'Bullish':
+        buy += 1
+    elif trend == 'Bearish':
+        sell += 1
+
+    if latest['Volume_Ratio'] > 1.5:
+        if buy > sell:
+            buy += 1
+        else:
+            sell += 1
+
+    net = buy - sell
+    if net > 2:
+        signal = 'STRONG BUY'
+    elif net > 0:
+        signal = 'BUY'
+    elif net < -2:
+        signal = 'STRONG SELL'
+    elif net < 0:
+        signal = 'SELL'
+    else:
+        signal = 'HOLD'
+    return {'signal': signal, 'confidence': min(abs(net) / 7 + 0.3, 0.95),
+            'buy_signals': buy, 'sell_signals': sell, 'trend': trend}
+
+
+# ─── INPUTS ───
+
+def _ohlcv(n=600, seed=0, case='clean'):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    high = close * (1 + rng.uniform(0, 0.02, n))
+    low = close * (1 - rng.uniform(0, 0.02, n))
+    volume = rng.integers(10_000, 1_000_000, n).astype(float)
+
+    if case == 'nan':
+        close[n // 2] = np.nan
+    elif case == 'zero_close':
+        close[n // 3] = 0.0
+    elif case == 'flat':
+        # Suspended stock: the last bars repeat one price
+        tail = slice(n - 25, n)
+        close[tail] = high[tail] = low[tail] = round(close[n - 26] * 1.01, 2)
+
+    return pd.DataFrame({'Open': close, 'High': high, 'Low': low, 'Close': close, 'Volume': volume},
+                        index=pd.date_range('2020-01-01', periods=n))
+
+
+def _assert_columns_match(actual, expected, columns):
+    for col in columns:
+        x = expected[col].to_numpy(dtype=float)
+        y = actual[col].to_numpy(dtype=float)
+        assert np.array_equal(np.isnan(x), np.isnan(y)), col
+        assert np.array_equal(x[np.isinf(x)], y[np.isinf(x)]), col
+        finite = np.isfinite(x)
+        assert np.isfinite(y[finite]).all(), col
+        err = np.abs(x[finite] - y[finite]) / np.maximum(1, np.abs(x[finite]))
+        assert err.max(initial=0) < 1e-7, col
+
+
+# ─── TESTS ───
+
+@pytest.mark.parametrize('case', ['clean', 'nan', 'zero_close'])
+def test_indicators_match_pandas_reference(case):
+    df = _ohlcv(case=case)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = _reference_indicators(df)
+        actual = calculate_technical_indicators(df)
+
+    assert list(actual.columns) == list(expected.columns)
+    _assert_columns_match(actual, expected, expected.columns[len(df.columns):])
+
+
+def test_flat_window_indicators():
+    df = _ohlcv(case='flat')
+    expected = _reference_indicators(df)
+    actual = calculate_technical_indicators(df)
+
+    # Windows entirely inside the flat stretch: the bands sit on the close
+    # and CCI is 0/0, whatever rounding residue pandas' own std leaves
+    flat = slice(-6, None)
+    assert (actual['BB_Upper'].iloc[flat] == actual['Close'].iloc[flat]).all()
+    assert (actual['BB_Lower'].iloc[flat] == actual['Close'].iloc[flat]).all()
+    assert (actual['SMA20'].iloc[flat] == actual['Close'].iloc[flat]).all()
+    assert actual['CCI'].iloc[flat].isna().all()
+
+    rest = expected.columns[len(df.columns):].drop(['BB_Upper', 'BB_Lower', 'BB_Width', 'CCI'])
+    _assert_columns_match(actual, expected, rest)
+    _assert_columns_match(actual.iloc[:-6], expected.iloc[:-6], ['BB_Upper', 'BB_Lower', 'BB_Width'])
+
+
+@pytest.mark.parametrize('case', ['clean', 'nan', 'zero_close', 'flat'])
+def test_signals_match_pandas_reference(case):
+    for seed in range(25):
+        df = _ohlcv(n=300, seed=seed, case=case)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            signals = generate_signals(calculate_technical_indicators(df))
+            expected = _reference_signals(_reference_indicators(df))
+
+        for key, value in expected.items():
+            assert signals[key] == pytest.approx(value), (seed, key)
+
+
+def test_signals_score_missing_values_as_neutral():
+    df = _reference_indicators(_ohlcv(n=300, seed=3))
+    df.loc[df.index[-1], ['RSI14', 'MACD', 'BB_Upper', 'BB_Lower', 'Volume_Ratio']] = np.nan
+
+    signals = generate_signals(df)
+    expected = _reference_signals(df)
+    assert signals['signal'] == expected['signal']
+    assert signals['buy_signals'] == expected['buy_signals']
+    assert signals['sell_signals'] == expected['sell_signals']
+
+
+@pytest.mark.parametrize('case', ['clean', 'nan', 'zero_close'])
+def test_polars_variant_matches(case):
+    pl = pytest.importorskip('polars')
+    from src.technical_indicators import calculate_technical_indicators_polars
+
+    df = _ohlcv(case=case)
+    frame = pl.DataFrame({col: df[col].to_numpy() for col in df.columns})
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = calculate_technical_indicators(df)
+    result = calculate_technical_indicators_polars(frame)
+    lazy = calculate_technical_indicators_polars(frame.lazy()).collect()
+
+    assert result.columns == list(expected.columns)
+    for out in (result, lazy):
+        actual = pd.DataFrame({col: out[col].to_numpy() for col in out.columns}, index=df.index)
+        _assert_columns_match(actual, expected, expected.columns[len(df.columns):])
+
+
+@pytest.fixture
+def full_recomputes(monkeypatch):
+    """Record the frames update_technical_indicators falls back to recomputing"""
+    calls = []
+    original = technical_indicators.calculate_technical_indicators
+
+    def spy(df, dtype=np.float64):
+        calls.append(len(df))
+        return original(df, dtype)
+
+    monkeypatch.setattr(technical_indicators, 'calculate_technical_indicators', spy)
+    return calls
+
+
+@pytest.mark.parametrize('case', ['clean', 'nan'])
+def test_update_matches_full_recompute(case, full_recomputes):
+    df = _ohlcv(case=case)
+    previous = calculate_technical_indicators(df.iloc[:500])
+    updated = update_technical_indicators(previous, df)
+
+    assert full_recomputes == []
+    assert updated.index.equals(df.index)
+    _assert_columns_match(updated, calculate_technical_indicators(df), updated.columns)
+
+
+def _shifted_index(df):
+    # The new frame's history does not line up with previous
+    return calculate_technical_indicators(df.iloc[:500]), df.set_axis(df.index + pd.Timedelta(days=1))
+
+
+def _edited_bar(df):
+    # A bar inside the recomputed lookback was revised (e.g. back-adjusted)
+    previous = calculate_technical_indicators(df.iloc[:500])
+    df = df.copy()
+    df.iloc[450, df.columns.get_loc('Close')] *= 1.05
+    return previous, df
+
+
+def _missing_state_column(df):
+    # previous lacks a column the recursive indicators continue from
+    return calculate_technical_indicators(df.iloc[:500]).drop(columns=['OBV']), df
+
+
+def _nan_state(df):
+    # The carried state is NaN, so it cannot seed the EMAs
+    df = df.copy()
+    df.iloc[299, df.columns.get_loc('Close')] = np.nan
+    return calculate_technical_indicators(df.iloc[:500]), df
+
+
+def _short_previous(df):
+    # previous is shorter than the lookback
+    return calculate_technical_indicators(df.iloc[:150]), df.iloc[:400]
+
+
+@pytest.mark.parametrize('scenario', [_shifted_index, _edited_bar, _missing_state_column,
+                                      _nan_state, _short_previous])
+def test_update_falls_back_to_full_recompute(scenario, full_recomputes):
+    previous, df = scenario(_ohlcv())
+    full_recomputes.clear()
+
+    updated = update_technical_indicators(previous, df)
+
+    assert full_recomputes == [len(df)]
+    _assert_columns_match(updated, calculate_technical_indicators(df), updated.columns[len(df.columns):])
+
+
+@pytest.fixture
+def empty_cache():
+    """Start with an empty indicator cache so every backend really computes"""
+    technical_indicators._indicator_cache.clear()
+    yield
+    technical_indicators._indicator_cache.clear()
+
+
+def _universe(aligned, cases=('clean', 'clean', 'clean')):
+    frames = {}
+    for seed, case in enumerate(cases):
+        df = _ohlcv(n=400, seed=seed, case=case)
+        frames[f'SYM{seed}'] = df if aligned else df.iloc[seed * 10:]
+    return frames
+
+
+def _assert_batch_matches(batch, data):
+    assert list(batch) == list(data)
+    # Compute the references after the batch, from an empty cache, so they
+    # cannot hand the batch its own results
+    technical_indicators._indicator_cache.clear()
+    for symbol, df in data.items():
+        expected = calculate_technical_indicators(df)
+        assert list(batch[symbol].columns) == list(expected.columns)
+        _assert_columns_match(batch[symbol], expected, expected.columns[len(df.columns):])
+
+
+@pytest.mark.parametrize('aligned, use_processes, backend', [
+    (False, False, None),                    # thread pool
+    (False, True, '_batch_in_processes'),    # shared-memory process pool
+    (True, True, '_batch_in_processes'),     # aligned, processes requested explicitly
+    (True, False, '_batch_stacked'),         # aligned universe, one 2-D pass
+])
+def test_batch_backends_match_single_symbol(aligned, use_processes, backend, empty_cache, monkeypatch):
+    used = []
+    for name in ('_batch_in_processes', '_batch_stacked'):
+        original = getattr(technical_indicators, name)
+        monkeypatch.setattr(technical_indicators, name,
+                            lambda *args, _name=name, _original=original: used.append(_name) or _original(*args))
+
+    data = _universe(aligned)
+    batch = calculate_technical_indicators_batch(data, max_workers=2, use_processes=use_processes)
+
+    assert used == ([backend] if backend else [])
+    _assert_batch_matches(batch, data)
+
+
+def test_stacked_batch_with_gaps(empty_cache):
+    # One symbol's NaN bar sends the whole 2-D block through ema's pandas
+    # fallback; every column must still equal its single-symbol result
+    data = _universe(aligned=True, cases=('clean', 'nan', 'zero_close', 'flat'))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        batch = calculate_technical_indicators_batch(data)
+        _assert_batch_matches(batch, data)
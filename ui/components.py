@@ -2,63 +2,106 @@
 Reusable UI Components for Modern Interface
 """
 
+from functools import lru_cache
+
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 
 
-def create_metric_card(label, value, delta=None, icon="📊", color="#667eea"):
-    """Create a styled metric card with proper display"""
-    # Create a custom HTML card that displays everything properly
-    delta_html = ""
-    if delta:
-        delta_color = "#48bb78" if str(delta).startswith("+") or float(str(delta).replace("%", "").replace("+", "").replace("-", "")) > 0 else "#f56565"
-        delta_html = f"<div style='font-size: 0.9rem; color: {delta_color}; margin-top: 5px;'>{delta}</div>"
+# ─── HTML TEMPLATES ───
+# Static card markup is built once at import; the helpers only fill in the
+# %s slots instead of re-running a large f-string on every rerender.
 
-    st.markdown(f"""
+_METRIC_CARD_HTML = """
     <div style='
         text-align: center;
         padding: 20px;
         background: white;
         border-radius: 12px;
         box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        border-top: 4px solid {color};
+        border-top: 4px solid %s;
         min-height: 140px;
         display: flex;
         flex-direction: column;
         justify-content: center;
     '>
-        <div style='font-size: 2.5rem; margin-bottom: 8px;'>{icon}</div>
-        <div style='font-size: 0.85rem; color: #718096; font-weight: 600; margin-bottom: 8px; text-transform: uppercase;'>{label}</div>
-        <div style='font-size: 1.8rem; font-weight: 700; color: #2d3748; word-wrap: break-word;'>{value}</div>
-        {delta_html}
+        <div style='font-size: 2.5rem; margin-bottom: 8px;'>%s</div>
+        <div style='font-size: 0.85rem; color: #718096; font-weight: 600; margin-bottom: 8px; text-transform: uppercase;'>%s</div>
+        <div style='font-size: 1.8rem; font-weight: 700; color: #2d3748; word-wrap: break-word;'>%s</div>
+        %s
     </div>
-    """, unsafe_allow_html=True)
+    """
 
+_METRIC_DELTA_HTML = "<div style='font-size: 0.9rem; color: %s; margin-top: 5px;'>%s</div>"
 
-def create_signal_badge(signal_type, text):
-    """Create a styled signal badge"""
-    colors = {
-        'bullish': '#c6f6d5',
-        'bearish': '#fed7d7',
-        'neutral': '#e2e8f0',
-        'buy': '#9ae6b4',
-        'sell': '#fc8181',
-        'hold': '#fbd38d'
-    }
+_INFO_CARD_HTML = """
+    <div style='
+        background: %s;
+        border-left: 5px solid %s;
+        border-radius: 10px;
+        padding: 20px;
+        margin: 15px 0;
+    '>
+        <h3 style='margin:0; color: #2d3748;'>%s %s</h3>
+        <p style='margin: 10px 0 0 0; color: #4a5568;'>%s</p>
+    </div>
+    """
+
+_SECTION_HEADER_HTML = """
+    <div style='
+        background: linear-gradient(135deg, #667eea 0%%, #764ba2 100%%);
+        color: white;
+        padding: 25px;
+        border-radius: 15px;
+        margin: 20px 0;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+    '>
+        <h1 style='margin:0; color: white;'>%s %s</h1>
+        %s
+    </div>
+    """
+
+_SECTION_SUBTITLE_HTML = "<p style='margin: 10px 0 0 0; font-size: 1.1rem; opacity: 0.9;'>%s</p>"
+
+
+def create_metric_card(label, value, delta=None, icon="📊", color="#667eea"):
+    """Create a styled metric card with proper display"""
+    # Create a custom HTML card that displays everything properly
+    delta_html = ""
+    if delta:
+        delta_color = "#48bb78" if str(delta).startswith("+") or float(str(delta).replace("%", "").replace("+", "").replace("-", "")) > 0 else "#f56565"
+        delta_html = _METRIC_DELTA_HTML % (delta_color, delta)
+
+    st.markdown(_METRIC_CARD_HTML % (color, icon, label, value, delta_html), unsafe_allow_html=True)
 
-    text_colors = {
-        'bullish': '#22543d',
-        'bearish': '#742a2a',
-        'neutral': '#2d3748',
-        'buy': '#22543d',
-        'sell': '#742a2a',
-        'hold': '#744210'
-    }
 
-    bg_color = colors.get(signal_type.lower(), '#e2e8f0')
-    text_color = text_colors.get(signal_type.lower(), '#2d3748')
+_BADGE_COLORS = {
+    'bullish': '#c6f6d5',
+    'bearish': '#fed7d7',
+    'neutral': '#e2e8f0',
+    'buy': '#9ae6b4',
+    'sell': '#fc8181',
+    'hold': '#fbd38d'
+}
+
+_BADGE_TEXT_COLORS = {
+    'bullish': '#22543d',
+    'bearish': '#742a2a',
+    'neutral': '#2d3748',
+    'buy': '#22543d',
+    'sell': '#742a2a',
+    'hold': '#744210'
+}
+
+
+@lru_cache(maxsize=256)
+def _build_badge(signal_type, text):
+    """Badge markup for one (signal_type, text) pair, cached across reruns"""
+    bg_color = _BADGE_COLORS.get(signal_type.lower(), '#e2e8f0')
+    text_color = _BADGE_TEXT_COLORS.get(signal_type.lower(), '#2d3748')
 
     return f"""
     <span style='
@@ -73,6 +116,11 @@ def create_signal_badge(signal_type, text):
     """
 
 
+def create_signal_badge(signal_type, text):
+    """Create a styled signal badge"""
+    return _build_badge(signal_type, text)
+
+
 def create_info_card(title, content, icon="ℹ️", type="info"):
     """Create an information card with styling"""
     colors = {
@@ -92,44 +140,25 @@ def create_info_card(title, content, icon="ℹ️", type="info"):
     bg = colors.get(type, colors['info'])
     border = border_colors.get(type, border_colors['info'])
 
-    st.markdown(f"""
-    <div style='
-        background: {bg};
-        border-left: 5px solid {border};
-        border-radius: 10px;
-        padding: 20px;
-        margin: 15px 0;
-    '>
-        <h3 style='margin:0; color: #2d3748;'>{icon} {title}</h3>
-        <p style='margin: 10px 0 0 0; color: #4a5568;'>{content}</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_INFO_CARD_HTML % (bg, border, icon, title, content), unsafe_allow_html=True)
 
 
 def create_section_header(title, subtitle=None, icon="📊"):
     """Create a styled section header"""
-    st.markdown(f"""
-    <div style='
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 25px;
-        border-radius: 15px;
-        margin: 20px 0;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-    '>
-        <h1 style='margin:0; color: white;'>{icon} {title}</h1>
-        {f"<p style='margin: 10px 0 0 0; font-size: 1.1rem; opacity: 0.9;'>{subtitle}</p>" if subtitle else ""}
-    </div>
-    """, unsafe_allow_html=True)
+    subtitle_html = _SECTION_SUBTITLE_HTML % subtitle if subtitle else ""
+    st.markdown(_SECTION_HEADER_HTML % (icon, title, subtitle_html), unsafe_allow_html=True)
 
 
 def create_price_chart(data, title="Price Chart"):
     """Create an interactive price chart with Plotly"""
-    fig = go.Figure()
+    # Traces are collected as plain dicts and validated once by the Figure
+    # constructor instead of one add_trace round trip each
+    traces = []
 
     # Add candlestick if OHLC available
     if all(col in data.columns for col in ['Open', 'High', 'Low', 'Close']):
-        fig.add_trace(go.Candlestick(
+        traces.append(dict(
+            type='candlestick',
             x=data.index,
             open=data['Open'],
             high=data['High'],
@@ -138,7 +167,8 @@ def create_price_chart(data, title="Price Chart"):
             name='Price'
         ))
     else:
-        fig.add_trace(go.Scatter(
+        traces.append(dict(
+            type='scatter',
             x=data.index,
             y=data['Close'],
             mode='lines',
@@ -148,7 +178,8 @@ def create_price_chart(data, title="Price Chart"):
 
     # Add moving averages if available
     if 'SMA20' in data.columns:
-        fig.add_trace(go.Scatter(
+        traces.append(dict(
+            type='scatter',
             x=data.index,
             y=data['SMA20'],
             mode='lines',
@@ -157,7 +188,8 @@ def create_price_chart(data, title="Price Chart"):
         ))
 
     if 'SMA50' in data.columns:
-        fig.add_trace(go.Scatter(
+        traces.append(dict(
+            type='scatter',
             x=data.index,
             y=data['SMA50'],
             mode='lines',
@@ -165,6 +197,8 @@ def create_price_chart(data, title="Price Chart"):
             line=dict(color='#f5576c', width=1, dash='dash')
         ))
 
+    fig = go.Figure(data=traces)
+
     fig.update_layout(
         title=title,
         xaxis_title='Date',
@@ -187,8 +221,8 @@ def create_price_chart(data, title="Price Chart"):
 
 def create_volume_chart(data, title="Volume Chart"):
     """Create a volume chart"""
-    colors = ['red' if data['Close'].iloc[i] < data['Open'].iloc[i] else 'green'
-              for i in range(len(data))]
+    # One vectorized comparison instead of two .iloc lookups per bar
+    colors = np.where(data['Close'].to_numpy() < data['Open'].to_numpy(), '#f56565', '#48bb78')
 
     fig = go.Figure(data=[go.Bar(
         x=data.index,
@@ -212,16 +246,31 @@ def create_comparison_chart(data_dict, title="Comparison Chart"):
     """Create a comparison chart for multiple stocks"""
     fig = go.Figure()
 
-    for symbol, data in data_dict.items():
-        # Normalize to percentage returns
-        normalized = (data['Close'] / data['Close'].iloc[0] - 1) * 100
-        fig.add_trace(go.Scatter(
-            x=data.index,
-            y=normalized,
-            mode='lines',
-            name=symbol,
-            line=dict(width=2)
-        ))
+    if data_dict:
+        # Normalize to percentage returns in one 2D divide: align all closes
+        # on a shared date index and scale each column by its first valid
+        # close. A repeated timestamp (yfinance sometimes sends the current
+        # day twice) keeps its last row so the indexes can be aligned
+        series = {symbol: data['Close'][~data.index.duplicated(keep='last')]
+                  for symbol, data in data_dict.items()}
+        closes = pd.concat(series, axis=1)
+        values = closes.to_numpy(dtype=float)
+        own = np.column_stack([closes.index.isin(close.index) for close in series.values()])
+        first = (own & ~np.isnan(values)).argmax(axis=0)
+        base = values[first, np.arange(values.shape[1])]
+        normalized = (values / base - 1) * 100
+
+        # Plotly still needs one trace per symbol; each keeps its own date
+        # range, including its NaN bars, so gaps in a line stay broken
+        for col, symbol in enumerate(closes.columns):
+            rows = own[:, col]
+            fig.add_trace(go.Scatter(
+                x=closes.index[rows],
+                y=normalized[rows, col],
+                mode='lines',
+                name=symbol,
+                line=dict(width=2)
+            ))
 
     fig.update_layout(
         title=title,
@@ -263,12 +312,27 @@ def create_gauge_chart(value, title, min_val=0, max_val=100, threshold_low=30, t
     return fig
 
 
-def create_heatmap(data, title="Correlation Heatmap"):
-    """Create a correlation heatmap"""
+def create_heatmap(data, title="Correlation Heatmap", raw=False):
+    """
+    Create a correlation heatmap
+
+    Args:
+        data: Correlation matrix, or with raw=True a frame of observations
+            (rows) per feature (columns) to correlate
+        title: Chart title
+        raw: Compute the correlation here instead of taking a precomputed one
+    """
+    if raw:
+        z = _correlation_matrix(data)
+        labels = data.columns
+    else:
+        z = data.values
+        labels = data.index
+
     fig = go.Figure(data=go.Heatmap(
-        z=data.values,
+        z=z,
         x=data.columns,
-        y=data.index,
+        y=labels,
         colorscale='RdBu',
         zmid=0
     ))
@@ -282,6 +346,22 @@ def create_heatmap(data, title="Correlation Heatmap"):
     return fig
 
 
+def _correlation_matrix(data):
+    """
+    Pearson correlation of the columns of data as one float32 matrix product
+
+    Rows with any missing value are dropped; the columns are standardized in
+    float32 and correlated with a single ``X.T @ X``, instead of pandas'
+    pairwise float64 ``corr``. Constant columns give NaN, as in pandas.
+    """
+    values = data.dropna().to_numpy(dtype=np.float32)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = values - values.mean(axis=0)
+        values /= np.sqrt((values * values).sum(axis=0))
+        corr = values.T @ values
+    return np.clip(corr, -1.0, 1.0)
+
+
 def create_progress_card(title, current, target, icon="🎯"):
     """Create a progress card showing progress towards a target"""
     percentage = min((current / target * 100) if target > 0 else 0, 100)